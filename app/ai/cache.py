@@ -0,0 +1,65 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class ResponseCache:
+    """In-memory LRU cache with per-entry TTL, split into named partitions"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def get(self, partition: str, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired"""
+        entry_key = (partition, key)
+        entry = self._entries.get(entry_key)
+
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[entry_key]
+            self._misses[partition] = self._misses.get(partition, 0) + 1
+            return None
+
+        self._entries.move_to_end(entry_key)
+        self._hits[partition] = self._hits.get(partition, 0) + 1
+        return entry[1]
+
+    def set(self, partition: str, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        entry_key = (partition, key)
+        self._entries[entry_key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(entry_key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self, partition: Optional[str] = None) -> None:
+        """Drop every entry, or only those of one partition"""
+        if partition is None:
+            self._entries.clear()
+            return
+        for entry_key in [k for k in self._entries if k[0] == partition]:
+            del self._entries[entry_key]
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size per partition"""
+        sizes: Dict[str, int] = {}
+        for partition, _ in self._entries:
+            sizes[partition] = sizes.get(partition, 0) + 1
+
+        partitions = set(sizes) | set(self._hits) | set(self._misses)
+        return {
+            partition: {
+                "entries": sizes.get(partition, 0),
+                "hits": self._hits.get(partition, 0),
+                "misses": self._misses.get(partition, 0),
+            }
+            for partition in sorted(partitions)
+        }
+
+
+response_cache = ResponseCache()
@@ -1,13 +1,98 @@
-import google.generativeai as genai
 from app.config import settings
+from app.ai.cache import response_cache
+from app.ai.language import ENGLISH, SWAHILI, MIXED, detect_language
+from app.ai.log_aggregation import build_security_summary, summary_digest
+from app.ai.model_router import FAST, QUALITY, ModelRouter
+from app.tracing import record_span, span
 from typing import Optional
+import asyncio
+import time
+
+CHAT_LANGUAGE_INSTRUCTIONS = {
+    ENGLISH: "Respond in English.",
+    SWAHILI: "Respond in Swahili.",
+    MIXED: "The user mixes Swahili and English (Sheng). Respond in the same natural mix of Swahili and English.",
+}
+
+CHAT_SUGGESTIONS = {
+    ENGLISH: ['Track my order', 'Payment help', 'Delivery info', 'Contact support'],
+    SWAHILI: ['Fuatilia agizo langu', 'Msaada wa malipo', 'Maelezo ya utoaji', 'Wasiliana na msaada'],
+    MIXED: ['Fuatilia agizo langu', 'Msaada wa malipo', 'Maelezo ya utoaji', 'Wasiliana na msaada'],
+}
+
+# Endpoints served through the near-duplicate cache
+SEMANTIC_CACHE_ENDPOINTS = ("product_description", "seo_metadata")
 
 class GeminiClient:
-    """Google Gemini AI client for generating content"""
+    """Google Gemini AI client for generating content
+    
+    The Gemini SDK, settings and NumPy-backed helpers are loaded on first use
+    (or by warm_up at startup) so importing the app stays cheap.
+    """
     
     def __init__(self):
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-pro')
+        self._configured = False
+        self._router: Optional[ModelRouter] = None
+        self._semantic_cache = None
+    
+    def _create_model(self, name: str):
+        import google.generativeai as genai
+        
+        if not self._configured:
+            genai.configure(api_key=settings.GEMINI_API_KEY)
+            self._configured = True
+        return genai.GenerativeModel(name)
+    
+    @property
+    def router(self) -> ModelRouter:
+        if self._router is None:
+            self._router = ModelRouter(
+                tier_models={FAST: settings.GEMINI_FAST_MODEL, QUALITY: settings.GEMINI_QUALITY_MODEL},
+                endpoint_tiers=settings.gemini_endpoint_tiers,
+                model_factory=self._create_model,
+                primary_timeout=settings.GEMINI_PRIMARY_TIMEOUT_SECONDS,
+                slow_threshold=settings.GEMINI_SLOW_THRESHOLD_SECONDS,
+                cooldown_seconds=settings.GEMINI_COOLDOWN_SECONDS
+            )
+        return self._router
+    
+    @property
+    def semantic_cache(self):
+        if self._semantic_cache is None:
+            from app.ai.semantic_cache import EndpointSemanticCache
+            
+            self._semantic_cache = EndpointSemanticCache(
+                thresholds=settings.semantic_cache_thresholds,
+                max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS
+            )
+        return self._semantic_cache
+    
+    @property
+    def listing_analyzer(self):
+        from app.ai.listing_analyzer import listing_analyzer
+        
+        return listing_analyzer
+    
+    async def warm_up(self) -> dict:
+        """Load local helpers and open the connection to every model tier"""
+        # Import the NumPy-backed helpers ahead of the first request
+        self.listing_analyzer
+        self.semantic_cache.warm_up(SEMANTIC_CACHE_ENDPOINTS)
+        detect_language("habari")
+        
+        if not settings.GEMINI_WARMUP:
+            return {}
+        return await self.router.warm_up(timeout=settings.GEMINI_WARMUP_TIMEOUT_SECONDS)
+    
+    def _use_local(self, confidence: float) -> bool:
+        """Whether a local heuristic result is good enough to skip Gemini"""
+        mode = settings.LISTING_ANALYSIS_MODE
+        if mode == "local":
+            return True
+        if mode == "gemini":
+            return False
+        return confidence >= settings.LISTING_ANALYSIS_MIN_CONFIDENCE
     
     async def generate_product_description(
         self,
@@ -17,13 +102,22 @@ class GeminiClient:
     ) -> str:
         """Generate AI product description"""
         
+        # The name must match exactly; only category and features are matched fuzzily
+        cache_text = f"{category} | {' ; '.join(features or [])}"
+        with span("cache"):
+            cached = self.semantic_cache.lookup("product_description", cache_text, key=name)
+        if cached is not None:
+            return cached
+        
+        prompt_started = time.perf_counter()
         features_text = "\n".join(f"- {feature}" for feature in (features or []))
+        features_block = f"Key Features:\n{features_text}" if features else ""
         
         prompt = f"""Generate a compelling, SEO-optimized product description for an e-commerce platform.
 
 Product Name: {name}
 Category: {category}
-{f'Key Features:\n{features_text}' if features else ''}
+{features_block}
 
 Requirements:
 - Write 2-3 paragraphs (150-200 words)
@@ -34,10 +128,15 @@ Requirements:
 - Focus on value proposition
 
 Product Description:"""
+        record_span("prompt", prompt_started)
 
         try:
-            response = self.model.generate_content(prompt)
-            return response.text.strip()
+            response = await self.router.generate("product_description", prompt)
+            with span("parse"):
+                description = response.text.strip()
+            with span("cache"):
+                self.semantic_cache.store("product_description", cache_text, description, key=name)
+            return description
         except Exception as e:
             raise Exception(f"Failed to generate description: {str(e)}")
     
@@ -49,6 +148,7 @@ Product Description:"""
     ) -> str:
         """Generate AI store description"""
         
+        prompt_started = time.perf_counter()
         prompt = f"""Generate a professional store description for an e-commerce marketplace.
 
 Store Name: {name}
@@ -63,10 +163,12 @@ Requirements:
 - Include category expertise
 
 Store Description:"""
+        record_span("prompt", prompt_started)
 
         try:
-            response = self.model.generate_content(prompt)
-            return response.text.strip()
+            response = await self.router.generate("store_description", prompt)
+            with span("parse"):
+                return response.text.strip()
         except Exception as e:
             raise Exception(f"Failed to generate store description: {str(e)}")
     
@@ -78,6 +180,12 @@ Store Description:"""
     ) -> list:
         """Generate relevant product tags"""
         
+        with span("local"):
+            local = self.listing_analyzer.extract_tags(name, description, category)
+        if self._use_local(local["confidence"]):
+            return local["tags"]
+        
+        prompt_started = time.perf_counter()
         prompt = f"""Generate 8-12 relevant tags for this product:
 
 Name: {name}
@@ -91,14 +199,18 @@ Requirements:
 - Format as comma-separated list
 
 Tags:"""
+        record_span("prompt", prompt_started)
 
         try:
-            response = self.model.generate_content(prompt)
-            tags_text = response.text.strip()
-            # Parse comma-separated tags
-            tags = [tag.strip() for tag in tags_text.split(',')]
+            response = await self.router.generate("product_tags", prompt)
+            with span("parse"):
+                tags_text = response.text.strip()
+                # Parse comma-separated tags
+                tags = [tag.strip() for tag in tags_text.split(',')]
             return tags[:12]  # Limit to 12 tags
         except Exception as e:
+            if local["tags"]:
+                return local["tags"]
             raise Exception(f"Failed to generate tags: {str(e)}")
     
     async def generate_seo_metadata(
@@ -109,6 +221,13 @@ Tags:"""
     ) -> dict:
         """Generate SEO title and meta description"""
         
+        cache_text = f"{category} | {description[:150]}"
+        with span("cache"):
+            cached = self.semantic_cache.lookup("seo_metadata", cache_text, key=name)
+        if cached is not None:
+            return dict(cached)
+        
+        prompt_started = time.perf_counter()
         prompt = f"""Generate SEO-optimized metadata for this product:
 
 Product Name: {name}
@@ -122,9 +241,11 @@ Generate:
 Format:
 TITLE: [your title here]
 META: [your meta description here]"""
+        record_span("prompt", prompt_started)
 
         try:
-            response = self.model.generate_content(prompt)
+            response = await self.router.generate("seo_metadata", prompt)
+            parse_started = time.perf_counter()
             text = response.text.strip()
             
             # Parse response
@@ -136,7 +257,11 @@ META: [your meta description here]"""
                     seo_data['title'] = line.replace('TITLE:', '').strip()
                 elif line.startswith('META:'):
                     seo_data['metaDescription'] = line.replace('META:', '').strip()
+            record_span("parse", parse_started)
             
+            if seo_data:
+                with span("cache"):
+                    self.semantic_cache.store("seo_metadata", cache_text, dict(seo_data), key=name)
             return seo_data
         except Exception as e:
             raise Exception(f"Failed to generate SEO metadata: {str(e)}")
@@ -150,6 +275,12 @@ META: [your meta description here]"""
     ) -> dict:
         """Analyze product listing quality and provide recommendations"""
         
+        with span("local"):
+            local = self.listing_analyzer.analyze_quality(name, description, price, category)
+        if self._use_local(local["confidence"]):
+            return {**local, "source": "local"}
+        
+        prompt_started = time.perf_counter()
         prompt = f"""Analyze this product listing quality:
 
 Name: {name}
@@ -168,22 +299,31 @@ Format as JSON:
   "strengths": ["point 1", "point 2"],
   "improvements": ["suggestion 1", "suggestion 2"]
 }}"""
+        record_span("prompt", prompt_started)
 
         try:
-            response = self.model.generate_content(prompt)
-            # For simplicity, return basic analysis
-            # In production, parse JSON response
+            response = await self.router.generate("quality_analysis", prompt)
+            
+            import json
+            import re
+            
+            with span("parse"):
+                json_match = re.search(r'\{[\s\S]*\}', response.text)
+                if not json_match:
+                    raise Exception("No JSON structure found")
+                analysis = json.loads(json_match.group(0))
+            
             return {
-                "score": 75,
-                "strengths": ["Clear product name", "Detailed description"],
-                "improvements": ["Add more product specifications", "Include customer benefits"]
+                "score": int(analysis["score"]),
+                "strengths": list(analysis.get("strengths", []))[:3],
+                "improvements": list(analysis.get("improvements", []))[:3],
+                "signals": local["signals"],
+                "confidence": local["confidence"],
+                "source": "gemini"
             }
         except Exception as e:
-            return {
-                "score": 70,
-                "strengths": ["Product listed successfully"],
-                "improvements": ["Consider adding more details"]
-            }
+            # Fall back to the local heuristic result
+            return {**local, "source": "local"}
 
     
     async def analyze_product_image(self, image_data: bytes, mime_type: str) -> dict:
@@ -224,7 +364,7 @@ DECISION RULES:
 Analyze the product image and return ONLY the JSON structure above."""
 
         try:
-            response = self.model.generate_content([
+            response = await self.router.generate("image_analysis", [
                 prompt,
                 {
                     "mime_type": mime_type,
@@ -238,11 +378,12 @@ Analyze the product image and return ONLY the JSON structure above."""
             import json
             import re
             
-            json_match = re.search(r'\{[\s\S]*\}', text)
-            if not json_match:
-                raise Exception("No JSON structure found")
-                
-            return json.loads(json_match.group(0))
+            with span("parse"):
+                json_match = re.search(r'\{[\s\S]*\}', text)
+                if not json_match:
+                    raise Exception("No JSON structure found")
+                    
+                return json.loads(json_match.group(0))
             
         except Exception as e:
             raise Exception(f"Failed to analyze image: {str(e)}")
@@ -250,12 +391,27 @@ Analyze the product image and return ONLY the JSON structure above."""
     async def analyze_security_briefing(self, health_data: dict, error_logs: list) -> dict:
         """Analyze system health and security logs"""
         
+        prompt_started = time.perf_counter()
+        # Aggregating large log batches is CPU-bound; keep it off the event loop
+        summary = await asyncio.to_thread(
+            build_security_summary,
+            health_data,
+            error_logs,
+            token_budget=settings.SECURITY_BRIEFING_TOKEN_BUDGET
+        )
+        cache_key = summary_digest(summary)
+        record_span("prompt", prompt_started)
+        with span("cache"):
+            cached = response_cache.get("security", cache_key)
+        if cached is not None:
+            return cached
+        
         prompt = f"""
         You are a Cyber Security Ops AI for ZetuMall.
-        Analyze the following system status and error logs to provide a security briefing.
+        Analyze the following system status and aggregated error logs to provide a security briefing.
+        Error patterns are deduplicated templates with occurrence counts; <n>, <uuid>, <ip> etc. are placeholders.
         
-        System Health: {health_data}
-        Recent Errors: {error_logs}
+{summary}
 
         Your response must be a valid JSON object with the following structure:
         {{
@@ -273,11 +429,14 @@ Analyze the product image and return ONLY the JSON structure above."""
         """
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await self.router.generate("security_briefing", prompt)
             text = response.text.strip().replace("```json", "").replace("```", "")
             
             import json
-            return json.loads(text)
+            with span("parse"):
+                briefing = json.loads(text)
+            response_cache.set("security", cache_key, briefing)
+            return briefing
         except Exception as e:
             # Fallback response
             return {
@@ -290,10 +449,13 @@ Analyze the product image and return ONLY the JSON structure above."""
     async def chat_support(self, message: str) -> dict:
         """Chat support for ZetuMall"""
         
-        # Simple language detection
-        swahili_keywords = ['habari', 'sawa', 'asante', 'tafadhali', 'nini', 'vipi', 'nina', 'nataka']
-        is_swahili = any(keyword in message.lower() for keyword in swahili_keywords)
-        language = 'sw' if is_swahili else 'en'
+        with span("language"):
+            language = detect_language(message)
+        cache_key = " ".join(message.lower().split())
+        with span("cache"):
+            cached = response_cache.get(f"chat:{language}", cache_key)
+        if cached is not None:
+            return dict(cached)
         
         system_prompt = """You are a helpful customer support assistant for ZetuMall, an e-commerce platform in Kenya.
 
@@ -301,8 +463,8 @@ IMPORTANT GUIDELINES:
 - You are a ZetuMall staff member helping customers
 - Be friendly, professional, and concise
 - Answer questions about orders, payments, delivery, products, and account issues
-- Support both English and Swahili languages
-- If you detect Swahili, respond in Swahili
+- Support English, Swahili and mixed Swahili/English (Sheng)
+- Follow the response language instruction given after the user message
 - For complex issues, suggest contacting human support
 - Never make up order numbers or specific details
 - Focus on general help and guidance
@@ -317,22 +479,18 @@ ZETUMALL FEATURES:
 
 Keep responses short (2-3 sentences max) and helpful."""
 
-        prompt = f"{system_prompt}\n\nUser message: {message}\n\nRespond in {'Swahili' if language == 'sw' else 'English'}."
+        prompt = f"{system_prompt}\n\nUser message: {message}\n\n{CHAT_LANGUAGE_INSTRUCTIONS[language]}"
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await self.router.generate("chat", prompt)
             reply = response.text
             
-            suggestions = [
-                'Fuatilia agizo langu', 'Msaada wa malipo', 'Maelezo ya utoaji', 'Wasiliana na msaada'
-            ] if language == 'sw' else [
-                'Track my order', 'Payment help', 'Delivery info', 'Contact support'
-            ]
-            
-            return {
+            result = {
                 "message": reply,
-                "suggestions": suggestions
+                "suggestions": list(CHAT_SUGGESTIONS[language])
             }
+            response_cache.set(f"chat:{language}", cache_key, result)
+            return dict(result)
         except Exception as e:
             raise Exception(f"Chat failed: {str(e)}")
 
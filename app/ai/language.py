@@ -0,0 +1,171 @@
+"""
+Local language identification for English / Swahili / mixed (Sheng) text.
+
+Tokens are looked up in small hand-curated lexicons first. Tokens that are
+in neither lexicon are scored with a character-bigram log-odds model built
+from those same lexicons at import time, which picks up Swahili morphology
+(open syllables, vowel endings, ``ku-``/``na-``/``ta-`` verb prefixes) without
+any network call.
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+
+ENGLISH = "en"
+SWAHILI = "sw"
+MIXED = "mixed"
+
+LANGUAGES = (ENGLISH, SWAHILI, MIXED)
+
+SWAHILI_LEXICON = frozenset("""
+habari sawa asante asanteni tafadhali nini vipi nina nataka ninataka tunataka
+jambo hujambo sijambo mambo poa shikamoo karibu karibuni ndio ndiyo hapana
+sijui sielewi naomba nisaidie msaada saidia saidieni tafuta nimeagiza agizo
+maagizo oda bidhaa duka maduka bei pesa malipo kulipa nimelipa lipa rudisha
+kurudisha marejesho usafirishaji utoaji kufika imefika haijafika lini leo kesho
+jana sasa hivi bado tayari wapi gani ngapi kwa nini kwanini mimi wewe yeye sisi
+nyinyi wao yangu yako yake yetu yenu yao changu chako langu lako wangu wako
+na ya wa za la cha vya kwa katika kutoka hadi mpaka au lakini pia tu sana
+kidogo zaidi nzuri mbaya ni si kuna hakuna iko haiko niko uko yuko tuko mko
+shida tatizo matatizo akaunti nenosiri ingia kujiandikisha simu namba
+ujumbe muuzaji wauzaji mnunuzi wanunuzi huduma wateja mteja salama uhakika
+nimepokea sijapokea nilipokea pokea tuma nitumie kutuma badilisha futa ghairi
+kughairi ninaweza unaweza naweza inawezekana nilikuwa ilikuwa itakuwa
+rafiki ndugu bwana bibi dada kaka mtoto watoto nyumba kazi chakula
+maji nguo viatu elfu mia moja mbili tatu nne tano
+manze msee wasee buda fiti fala mbogi kuchill niaje sema rieng ganji
+mulla kitu mabeshte beshte mathe chapaa
+""".split())
+
+ENGLISH_LEXICON = frozenset("""
+i me my mine you your yours he him his she her it its we us our they them their
+the a an and or but if then so because of to in on at by for with from about
+into over after before under up down out is am are was were be been being have
+has had do does did done will would can could should may might must not no yes
+this that these those what which who whom whose when where why how all any
+some each every more most other such only own same than too very just also
+hello hi hey thanks thank please help want need get got give track order
+orders ordered payment pay paid refund return delivery deliver delivered
+shipping shipped ship product products item items store shop seller buyer
+account password login sign email phone number price cost money cash card
+problem issue wrong broken late still yet today tomorrow yesterday now soon
+status check cancel change update contact support customer service arrive
+arrived received receive sent send where buy bought sell sold new good bad
+""".split())
+
+# Brand and place names, and slang used the same way in Kenyan English and
+# Swahili; never counted as evidence for either language
+NEUTRAL_TOKENS = frozenset("""
+m-pesa mpesa zetumall ok okay nairobi mombasa kisumu nakuru eldoret kenya
+mama baba vibe dem doh
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z]+(?:[-'][a-z]+)*")
+
+# Share of the minority language required before a message counts as mixed
+MIXED_MIN_SHARE = 0.2
+
+# Lower share that is still mixed when the minority side has a lexicon hit
+MIXED_MIN_SHARE_LEXICON = 0.1
+
+# Minimum |log-odds| per bigram before an unknown token is counted at all
+MODEL_MARGIN = 0.35
+
+# Unknown tokens carry less weight than exact lexicon hits
+MODEL_WEIGHT = 0.5
+
+
+def _bigrams(word: str) -> Iterable[str]:
+    padded = f"^{word}$"
+    return (padded[i:i + 2] for i in range(len(padded) - 1))
+
+
+def _train_log_odds(
+    positive: Iterable[str],
+    negative: Iterable[str]
+) -> Tuple[Dict[str, float], float]:
+    """Build add-one smoothed bigram log-odds log P(bg|pos) - log P(bg|neg)"""
+    pos_counts: Dict[str, int] = {}
+    neg_counts: Dict[str, int] = {}
+    for words, counts in ((positive, pos_counts), (negative, neg_counts)):
+        for word in words:
+            for bigram in _bigrams(word):
+                counts[bigram] = counts.get(bigram, 0) + 1
+
+    vocabulary = set(pos_counts) | set(neg_counts)
+    pos_total = sum(pos_counts.values()) + len(vocabulary) + 1
+    neg_total = sum(neg_counts.values()) + len(vocabulary) + 1
+
+    table = {
+        bigram: math.log((pos_counts.get(bigram, 0) + 1) / pos_total)
+        - math.log((neg_counts.get(bigram, 0) + 1) / neg_total)
+        for bigram in vocabulary
+    }
+    unseen = math.log(1 / pos_total) - math.log(1 / neg_total)
+    return table, unseen
+
+
+_LOG_ODDS, _UNSEEN_LOG_ODDS = _train_log_odds(
+    SWAHILI_LEXICON - ENGLISH_LEXICON,
+    ENGLISH_LEXICON - SWAHILI_LEXICON
+)
+
+
+@lru_cache(maxsize=8192)
+def _token_score(token: str) -> float:
+    """Positive for Swahili, negative for English, 0.0 when undecided"""
+    if token in NEUTRAL_TOKENS:
+        return 0.0
+
+    in_sw = token in SWAHILI_LEXICON
+    in_en = token in ENGLISH_LEXICON
+    if in_sw != in_en:
+        return 1.0 if in_sw else -1.0
+    if in_sw or len(token) < 3:
+        return 0.0
+
+    bigrams = list(_bigrams(token))
+    mean = sum(_LOG_ODDS.get(bg, _UNSEEN_LOG_ODDS) for bg in bigrams) / len(bigrams)
+    if abs(mean) < MODEL_MARGIN:
+        return 0.0
+    return MODEL_WEIGHT if mean > 0 else -MODEL_WEIGHT
+
+
+def _evidence(text: str) -> Tuple[float, float, int, int]:
+    """Accumulated (swahili, english) evidence plus exact lexicon hits per side"""
+    swahili = english = 0.0
+    swahili_hits = english_hits = 0
+    for token in _TOKEN_RE.findall(text.lower()):
+        score = _token_score(token)
+        if score > 0:
+            swahili += score
+            swahili_hits += score == 1.0
+        elif score < 0:
+            english -= score
+            english_hits += score == -1.0
+    return swahili, english, swahili_hits, english_hits
+
+
+def language_scores(text: str) -> Tuple[float, float]:
+    """Return accumulated (swahili, english) evidence for a piece of text"""
+    swahili, english, _, _ = _evidence(text)
+    return swahili, english
+
+
+@lru_cache(maxsize=4096)
+def detect_language(text: str) -> str:
+    """Classify text as ``en``, ``sw`` or ``mixed``; defaults to ``en``"""
+    swahili, english, swahili_hits, english_hits = _evidence(text)
+    total = swahili + english
+    if total == 0:
+        return ENGLISH
+
+    minority = min(swahili, english)
+    share = minority / total
+    # Bigram-model guesses alone (brand names, loanwords) never make text mixed
+    minority_hits = swahili_hits if swahili < english else english_hits
+    if minority_hits and (share >= MIXED_MIN_SHARE or (minority >= 1.0 and share >= MIXED_MIN_SHARE_LEXICON)):
+        return MIXED
+    return SWAHILI if swahili > english else ENGLISH
@@ -0,0 +1,342 @@
+"""
+Local listing-quality scoring and tag extraction.
+
+Quality is scored from cheap text signals (description length, spec density,
+readability, title shape, price sanity against the running price
+distribution of the category). Tags are TF-IDF weighted unigrams and
+bigrams, with document frequencies taken from a per-category corpus that
+grows as listings are analyzed. Each distinct listing is counted once and
+only a bounded number of categories is kept. Everything runs in-process with
+NumPy; each result carries a ``confidence`` so callers can escalate to Gemini
+when the heuristics are unsure.
+"""
+
+import hashlib
+import math
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.\-][a-z0-9]+)*")
+_WORD_RE = re.compile(r"[A-Za-z]+")
+_SENTENCE_RE = re.compile(r"[.!?]+(?:\s|$)")
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+_SPEC_RE = re.compile(
+    r"\b\d+(?:[.,]\d+)?\s?(?:gb|tb|mb|mah|mp|hz|ghz|w|kw|v|kg|g|mg|ml|l|cm|mm|m|inch|in|\"|pcs|pieces|years?|months?)\b"
+    r"|\b\d+\s?x\s?\d+\b",
+    re.I,
+)
+_PHRASE_BREAK_RE = re.compile(r"[,;:!?()\n]|\.(?=\s|$)")
+_SPEC_LINE_RE = re.compile(r"^\s*(?:[-*•]|\w[\w ]{0,30}:)", re.M)
+
+STOPWORDS = frozenset("""
+a an the and or but if then so of to in on at by for with from about into over
+is are was were be been being it its this that these those you your our we
+they their them he she his her i my me as not no yes can will would should
+all any some more most very just also than too up down out only own same
+new best great high good quality perfect amazing excellent buy now get
+product item items use used using one two per each other such which who
+has have had comes come includes include features made designed make makes
+na ya wa za la kwa ni kwa katika hii hizi huo
+""".split())
+
+# Weights for [length, spec_density, readability, title, price]
+SIGNAL_WEIGHTS = np.array([0.3, 0.25, 0.15, 0.15, 0.15])
+SIGNAL_NAMES = ("length", "specDensity", "readability", "title", "price")
+
+# Listings of a category needed before price outliers are flagged
+MIN_PRICE_OBSERVATIONS = 20
+
+# Vocabulary cap per category corpus, bounds memory for long-running workers
+MAX_VOCABULARY = 20000
+
+# Category corpora kept; categories are client-supplied, so least recently
+# used ones are dropped beyond this
+MAX_CATEGORIES = 64
+
+# Listings remembered so re-analyzing one does not count it again
+MAX_SEEN_LISTINGS = 20000
+
+# Prices further than this from the category mean (in log-price standard
+# deviations) are not learned from
+MAX_LEARN_Z_SCORE = 4.0
+
+MAX_TAGS = 12
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _is_candidate(token: str) -> bool:
+    return len(token) > 1 and token not in STOPWORDS and not token.replace(".", "").isdigit()
+
+
+def listing_terms(name: str, description: str) -> Set[str]:
+    """Distinct candidate unigrams of a listing, as counted in its category corpus"""
+    return {t for t in tokenize(f"{name} {description}") if _is_candidate(t)}
+
+
+def _valid_price(price: float) -> bool:
+    """Positive and finite; request JSON may carry NaN or Infinity"""
+    return math.isfinite(price) and price > 0
+
+
+def _ramp(value: float, low: float, high: float) -> float:
+    """0 at ``low``, 1 at ``high``, linear in between"""
+    if high == low:
+        return 1.0 if value >= high else 0.0
+    return float(min(1.0, max(0.0, (value - low) / (high - low))))
+
+
+class CategoryCorpus:
+    """Running document frequencies and log-price statistics for one category"""
+
+    def __init__(self):
+        self.documents = 0
+        self.document_frequency: Dict[str, int] = {}
+        self.price_count = 0
+        self._log_price_mean = 0.0
+        self._log_price_m2 = 0.0
+
+    def observe(self, terms: Set[str]) -> None:
+        self.documents += 1
+        for term in terms:
+            if term in self.document_frequency:
+                self.document_frequency[term] += 1
+            elif len(self.document_frequency) < MAX_VOCABULARY:
+                self.document_frequency[term] = 1
+
+    def observe_price(self, price: float) -> bool:
+        """Add a price to the running statistics unless it is invalid or an outlier"""
+        if not _valid_price(price):
+            return False
+        z_score = self.price_z_score(price)
+        if z_score is not None and abs(z_score) > MAX_LEARN_Z_SCORE:
+            return False
+        # Welford's online mean/variance on log price
+        self.price_count += 1
+        log_price = math.log(price)
+        delta = log_price - self._log_price_mean
+        self._log_price_mean += delta / self.price_count
+        self._log_price_m2 += delta * (log_price - self._log_price_mean)
+        return True
+
+    def idf(self, terms: List[str]) -> np.ndarray:
+        df = np.fromiter((self.document_frequency.get(t, 0) for t in terms), dtype=np.float64, count=len(terms))
+        return np.log((self.documents + 1) / (df + 1)) + 1.0
+
+    def price_z_score(self, price: float) -> Optional[float]:
+        if not _valid_price(price) or self.price_count < MIN_PRICE_OBSERVATIONS:
+            return None
+        std = math.sqrt(self._log_price_m2 / (self.price_count - 1))
+        if std == 0:
+            return 0.0
+        return (math.log(price) - self._log_price_mean) / std
+
+
+class ListingAnalyzer:
+    """Heuristic quality scorer and TF-IDF tag extractor"""
+
+    def __init__(self, max_categories: int = MAX_CATEGORIES, max_seen_listings: int = MAX_SEEN_LISTINGS):
+        self.max_categories = max_categories
+        self.max_seen_listings = max_seen_listings
+        self.corpora: "OrderedDict[str, CategoryCorpus]" = OrderedDict()
+        # (category, listing digest) -> whether its price has been considered
+        self._seen: "OrderedDict[Tuple[str, bytes], bool]" = OrderedDict()
+
+    def corpus(self, category: str) -> CategoryCorpus:
+        key = category.strip().lower()
+        corpus = self.corpora.get(key)
+        if corpus is None:
+            corpus = self.corpora[key] = CategoryCorpus()
+            if len(self.corpora) > self.max_categories:
+                self.corpora.popitem(last=False)
+        else:
+            self.corpora.move_to_end(key)
+        return corpus
+
+    def learn(self, name: str, description: str, category: str, price: Optional[float] = None) -> None:
+        """Add a listing to its category corpus, once however often it is analyzed"""
+        text = f"{' '.join(name.lower().split())}\n{' '.join(description.lower().split())}"
+        key = (category.strip().lower(), hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest())
+        corpus = self.corpus(category)
+
+        price_seen = self._seen.get(key)
+        if price_seen is None:
+            terms = listing_terms(name, description)
+            if terms:
+                corpus.observe(terms)
+            price_seen = False
+        else:
+            self._seen.move_to_end(key)
+
+        # Only the first price given for a listing is considered, so re-checks
+        # with a different (or fake) price cannot move the category statistics
+        if not price_seen and price is not None:
+            corpus.observe_price(price)
+            price_seen = True
+
+        self._seen[key] = price_seen
+        if len(self._seen) > self.max_seen_listings:
+            self._seen.popitem(last=False)
+
+    def quality_signals(self, name: str, description: str, price: float, category: str) -> Tuple[np.ndarray, bool]:
+        """Return signal vector in [0, 1] and whether the price could be checked"""
+        words = _WORD_RE.findall(description)
+        word_count = len(words)
+
+        length = _ramp(word_count, 15, 80) * (1.0 if word_count <= 600 else 0.7)
+
+        spec_hits = len(_SPEC_RE.findall(description)) + len(_SPEC_LINE_RE.findall(description))
+        spec_density = _ramp(spec_hits * 100 / max(word_count, 1), 0.5, 5.0)
+
+        if word_count:
+            syllables = np.fromiter(
+                (max(1, len(_VOWEL_GROUP_RE.findall(w.lower()))) for w in words),
+                dtype=np.int32,
+                count=word_count,
+            )
+            sentences = max(1, len(_SENTENCE_RE.findall(description)))
+            # Flesch reading ease, mapped so 30 -> 0 and 70 -> 1
+            flesch = 206.835 - 1.015 * (word_count / sentences) - 84.6 * float(syllables.mean())
+            # Too little text to judge readability is treated as neutral-poor
+            readability = _ramp(flesch, 30, 70) * _ramp(word_count, 0, 15)
+            letters = [c for c in description if c.isalpha()]
+            caps_ratio = sum(c.isupper() for c in letters) / max(len(letters), 1)
+            readability *= 1.0 - _ramp(caps_ratio, 0.3, 0.7)
+        else:
+            readability = 0.0
+
+        name_length = len(name.strip())
+        title = _ramp(name_length, 5, 20) * (1.0 if name_length <= 120 else 0.6)
+        if name.isupper() and name_length > 10:
+            title *= 0.7
+
+        z_score = self.corpus(category).price_z_score(price)
+        valid_price = _valid_price(price)
+        if not valid_price:
+            price_signal = 0.0
+        elif z_score is None:
+            price_signal = 1.0
+        else:
+            price_signal = 1.0 - _ramp(abs(z_score), 2.0, 4.0)
+
+        signals = np.array([length, spec_density, readability, title, price_signal])
+        return signals, not valid_price or z_score is not None
+
+    def analyze_quality(self, name: str, description: str, price: float, category: str) -> dict:
+        """Score a listing 0-100 with strengths, improvements and a confidence"""
+        signals, price_checked = self.quality_signals(name, description, price, category)
+        score = int(round(float(SIGNAL_WEIGHTS @ signals) * 100))
+
+        strengths = []
+        improvements = []
+        if signals[0] >= 0.8:
+            strengths.append("Detailed description")
+        elif signals[0] < 0.5:
+            improvements.append("Expand the description to at least 80 words")
+        if signals[1] >= 0.6:
+            strengths.append("Good technical specifications")
+        elif signals[1] < 0.3:
+            improvements.append("Add product specifications (size, capacity, materials)")
+        if signals[2] >= 0.7:
+            strengths.append("Easy to read")
+        elif signals[2] < 0.4:
+            improvements.append("Use shorter sentences and avoid all-caps text")
+        if signals[3] >= 0.8:
+            strengths.append("Clear product name")
+        elif signals[3] < 0.5:
+            improvements.append("Use a more descriptive product name")
+        if signals[4] < 0.5:
+            improvements.append("Check the price; it is unusual for this category")
+
+        if not strengths:
+            strengths.append("Product listed successfully")
+        if not improvements:
+            improvements.append("Include customer benefits")
+
+        # Signals far from the middle are unambiguous; unchecked prices and
+        # very short texts make the heuristic less trustworthy
+        confidence = 0.5 + 0.5 * float(np.abs(signals - 0.5).mean() * 2)
+        if not price_checked:
+            confidence *= 0.9
+        if len(description) < 40:
+            confidence *= 0.8
+
+        self.learn(name, description, category, price)
+
+        return {
+            "score": score,
+            "strengths": strengths[:3],
+            "improvements": improvements[:3],
+            "signals": {k: round(float(v), 3) for k, v in zip(SIGNAL_NAMES, signals)},
+            "confidence": round(confidence, 3),
+        }
+
+    def extract_tags(self, name: str, description: str, category: str, limit: int = MAX_TAGS) -> dict:
+        """TF-IDF ranked unigram/bigram tags with a confidence"""
+        corpus = self.corpus(category)
+        name_tokens = set(tokenize(name))
+
+        phrases: List[str] = []
+        for segment in [name, *_PHRASE_BREAK_RE.split(description)]:
+            run: List[str] = []
+            for token in tokenize(segment) + [""]:
+                if token and _is_candidate(token):
+                    run.append(token)
+                    continue
+                phrases.extend(run)
+                phrases.extend(f"{a} {b}" for a, b in zip(run, run[1:]))
+                run = []
+
+        if not phrases:
+            return {"tags": [category.strip().lower()] if category.strip() else [], "confidence": 0.0}
+
+        terms, counts = np.unique(np.array(phrases), return_counts=True)
+        terms = terms.tolist()
+        unigrams = [t.split(" ") for t in terms]
+
+        # Bigram idf is the mean of its parts so unseen pairs are not overrated
+        parts_list = list({p for parts in unigrams for p in parts})
+        part_idf = dict(zip(parts_list, corpus.idf(parts_list)))
+        idf = np.fromiter(
+            (sum(part_idf[p] for p in parts) / len(parts) for parts in unigrams),
+            dtype=np.float64,
+            count=len(terms),
+        )
+        boost = np.fromiter(
+            (
+                (2.0 if any(p in name_tokens for p in parts) else 1.0) * (1.3 if len(parts) > 1 else 1.0)
+                for parts in unigrams
+            ),
+            dtype=np.float64,
+            count=len(terms),
+        )
+        scores = (1 + np.log(counts)) * idf * boost
+
+        tags: List[str] = []
+        category_tag = category.strip().lower()
+        if category_tag:
+            tags.append(category_tag)
+        for index in np.argsort(-scores, kind="stable"):
+            term = terms[index]
+            words = term.split(" ")
+            selected = {w for tag in tags for w in tag.split(" ")}
+            # Skip words already covered by a phrase, and phrases fully covered by tags
+            if term in tags or all(w in selected for w in words):
+                continue
+            tags.append(term)
+            if len(tags) >= limit:
+                break
+
+        # More distinct candidates and a warmer corpus make TF-IDF more reliable
+        confidence = _ramp(len(terms), 4, 16) * (0.6 + 0.4 * _ramp(corpus.documents, 0, 50))
+        self.learn(name, description, category)
+
+        return {"tags": tags, "confidence": round(confidence, 3)}
+
+
+listing_analyzer = ListingAnalyzer()
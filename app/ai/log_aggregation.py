@@ -0,0 +1,228 @@
+"""
+Pre-aggregation of error logs for the security briefing prompt.
+
+Raw error entries are collapsed into clusters keyed by a normalized message
+template (ids, numbers, addresses and quoted values replaced by
+placeholders), counted, bucketed into time windows and rendered into a
+compact text summary that fits a token budget.
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# (placeholder, pattern) pairs applied in order; most specific first
+_NORMALIZERS: List[Tuple[str, "re.Pattern[str]"]] = [
+    ("<uuid>", re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I)),
+    ("<email>", re.compile(r"\b[\w.+-]+@[\w-]+\.[\w.-]+\b")),
+    ("<url>", re.compile(r"\bhttps?://\S+")),
+    ("<ip>", re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b")),
+    ("<ts>", re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?\b")),
+    ("<hex>", re.compile(r"\b(?:0x)?[0-9a-f]{12,}\b", re.I)),
+    ("<str>", re.compile(r"'[^']*'|\"[^\"]*\"")),
+    ("<n>", re.compile(r"\d+(?:\.\d+)?")),
+]
+
+_MESSAGE_KEYS = ("message", "error", "msg", "detail", "description")
+_TIMESTAMP_KEYS = ("timestamp", "time", "created_at", "createdAt", "date")
+_LEVEL_KEYS = ("level", "severity", "type")
+_ENDPOINT_KEYS = ("endpoint", "path", "route", "url")
+
+# Trailing windows, in seconds, error counts are reported for
+TIME_WINDOWS = (("5m", 300), ("1h", 3600), ("24h", 86400))
+
+# Rough characters-per-token ratio used for budgeting
+CHARS_PER_TOKEN = 4
+
+# Longest sample message kept per cluster
+MAX_SAMPLE_CHARS = 160
+
+# Tokens kept free for the trailing "omitted" / "none" line
+FOOTER_TOKENS = 16
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate; good enough for budgeting prompts"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def normalize_message(message: str) -> str:
+    """Reduce a log message to its template"""
+    template = message.strip()
+    for placeholder, pattern in _NORMALIZERS:
+        template = pattern.sub(placeholder, template)
+    return " ".join(template.split())
+
+
+def _first(entry: dict, keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        value = entry.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _parse_timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds, or None for anything that is not a representable time"""
+    timestamp: Optional[float] = None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        # Accept both seconds and milliseconds since the epoch
+        timestamp = value / 1000 if value > 1e11 else float(value)
+    elif isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            timestamp = parsed.timestamp()
+        except (ValueError, OverflowError, OSError):
+            return None
+    if timestamp is None:
+        return None
+
+    # Reject times _isoformat could not render back (NaN, overflow, year 0 or 10000+)
+    try:
+        datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        return None
+    return timestamp
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def aggregate_error_logs(error_logs: List[dict]) -> dict:
+    """Deduplicate error entries into templated clusters with counts and rates"""
+    clusters: Dict[Tuple[str, str], dict] = {}
+    timestamps: List[float] = []
+
+    for entry in error_logs:
+        if not isinstance(entry, dict):
+            entry = {"message": str(entry)}
+
+        message = _first(entry, _MESSAGE_KEYS)
+        message = str(message) if message is not None else json.dumps(entry, sort_keys=True, default=str)
+        level = str(_first(entry, _LEVEL_KEYS) or "error").lower()
+        template = normalize_message(message)
+        timestamp = _parse_timestamp(_first(entry, _TIMESTAMP_KEYS))
+        endpoint = _first(entry, _ENDPOINT_KEYS)
+
+        cluster = clusters.get((level, template))
+        if cluster is None:
+            cluster = clusters[(level, template)] = {
+                "template": template,
+                "level": level,
+                "count": 0,
+                "sample": message[:MAX_SAMPLE_CHARS],
+                "endpoints": set(),
+                "timestamps": [],
+            }
+        cluster["count"] += 1
+        if endpoint is not None:
+            cluster["endpoints"].add(str(endpoint))
+        if timestamp is not None:
+            cluster["timestamps"].append(timestamp)
+            timestamps.append(timestamp)
+
+    # Windows are anchored on the newest entry so identical logs aggregate identically
+    reference = max(timestamps) if timestamps else None
+    windows = {}
+    if reference is not None:
+        for label, seconds in TIME_WINDOWS:
+            count = sum(1 for ts in timestamps if reference - ts <= seconds)
+            windows[label] = {"errors": count, "perMinute": round(count / (seconds / 60), 3)}
+
+    summarized = []
+    for cluster in sorted(clusters.values(), key=lambda c: (-c["count"], c["template"])):
+        cluster_ts = cluster.pop("timestamps")
+        cluster["endpoints"] = sorted(cluster["endpoints"])
+        cluster["firstSeen"] = _isoformat(min(cluster_ts)) if cluster_ts else None
+        cluster["lastSeen"] = _isoformat(max(cluster_ts)) if cluster_ts else None
+        summarized.append(cluster)
+
+    return {
+        "totalErrors": len(error_logs),
+        "uniqueTemplates": len(summarized),
+        "timedEntries": len(timestamps),
+        "latest": _isoformat(reference),
+        "windows": windows,
+        "clusters": summarized,
+    }
+
+
+def _render_cluster(cluster: dict) -> str:
+    line = f"- [{cluster['level']}] x{cluster['count']}: {cluster['template']}"
+    if cluster["endpoints"]:
+        line += f" | endpoints: {', '.join(cluster['endpoints'][:3])}"
+    if cluster["firstSeen"]:
+        line += f" | {cluster['firstSeen']} .. {cluster['lastSeen']}"
+    return line
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    max_chars = max(max_tokens, 0) * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max(max_chars - 3, 0)] + "..."
+
+
+def build_security_summary(health_data: dict, error_logs: List[dict], token_budget: int) -> str:
+    """Render health data and aggregated errors into at most ``token_budget`` tokens"""
+    aggregate = aggregate_error_logs(error_logs)
+
+    # Health data gets at most a quarter of the budget; errors get the rest
+    health_text = json.dumps(health_data, sort_keys=True, separators=(",", ":"), default=str)
+    health_text = _truncate_to_tokens(health_text, token_budget // 4)
+
+    header = [
+        f"System Health: {health_text}",
+        f"Error Summary: {aggregate['totalErrors']} errors, "
+        f"{aggregate['uniqueTemplates']} unique patterns",
+    ]
+    if aggregate["windows"]:
+        rates = ", ".join(
+            f"{label}: {window['errors']} ({window['perMinute']}/min)"
+            for label, window in aggregate["windows"].items()
+        )
+        header.append(f"Error Rates (up to {aggregate['latest']}): {rates}")
+    header.append("Top Error Patterns:")
+
+    # The header is cut down too when the budget is small
+    header_text = _truncate_to_tokens("\n".join(header), token_budget - FOOTER_TOKENS)
+    lines = [header_text]
+    used = estimate_tokens(header_text)
+    clusters = aggregate["clusters"]
+    included = 0
+
+    for cluster in clusters:
+        line = _render_cluster(cluster)
+        # Each line also costs its newline; keep room for the trailing note
+        cost = estimate_tokens(line) + 1
+        if used + cost > token_budget - FOOTER_TOKENS:
+            break
+        lines.append(line)
+        used += cost
+        included += 1
+
+    omitted = clusters[included:]
+    if omitted:
+        lines.append(
+            f"- ... {len(omitted)} more patterns "
+            f"({sum(c['count'] for c in omitted)} errors) omitted"
+        )
+    elif not clusters:
+        lines.append("- none")
+
+    # Hard cap for budgets too small to hold even the trailing note
+    return _truncate_to_tokens("\n".join(lines), token_budget)
+
+
+def summary_digest(summary: str) -> str:
+    """Stable cache key for a rendered summary"""
+    return hashlib.sha256(summary.encode("utf-8")).hexdigest()
@@ -0,0 +1,253 @@
+"""
+Latency-aware routing of Gemini calls across model tiers.
+
+Each endpoint has a primary tier ("fast" or "quality"). Per-model latency
+(EWMA), error streaks and rate limits are tracked live; a model that is
+rate-limited, repeatedly unavailable or slower than the configured threshold
+is put into a short cooldown and calls fall back to the other tier until it
+expires. Errors caused by the request itself (invalid arguments, blocked
+prompts) are raised straight away: they say nothing about the model's health
+and another model would reject the request too. Image requests never fall
+back to a text-only model.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from app.tracing import record_span
+
+FAST = "fast"
+QUALITY = "quality"
+
+DEFAULT_ENDPOINT_TIERS = {
+    "product_description": QUALITY,
+    "store_description": QUALITY,
+    "product_tags": FAST,
+    "seo_metadata": FAST,
+    "quality_analysis": FAST,
+    "image_analysis": FAST,
+    "security_briefing": QUALITY,
+    "chat": FAST,
+}
+
+# Smoothing factor for the latency EWMA
+LATENCY_ALPHA = 0.3
+
+# Consecutive failures before a model is put into cooldown
+MAX_CONSECUTIVE_ERRORS = 3
+
+# Models that only accept text; image requests never fall back to them
+TEXT_ONLY_MODELS = frozenset({"gemini-pro", "gemini-1.0-pro"})
+
+_UNAVAILABLE_ERRORS = ("ServiceUnavailable", "InternalServerError", "ServerError", "DeadlineExceeded", "GatewayTimeout")
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """True for quota / 429 errors from the Gemini API"""
+    name = type(error).__name__
+    return name in ("ResourceExhausted", "TooManyRequests") or "429" in str(error)
+
+
+def is_unavailable(error: Exception) -> bool:
+    """True for 5xx / unavailable / network errors, i.e. the model side is unhealthy"""
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and code >= 500:
+        return True
+    return type(error).__name__ in _UNAVAILABLE_ERRORS or isinstance(error, ConnectionError)
+
+
+def is_multimodal(contents: Any) -> bool:
+    """True when ``contents`` carries non-text parts such as an inline image"""
+    return not isinstance(contents, str) and any(not isinstance(part, str) for part in contents)
+
+
+class ModelStats:
+    """Live latency, error and usage counters for one model"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.client_errors = 0
+        self.rate_limited = 0
+        self.timeouts = 0
+        self.latency_sum = 0.0
+        self.latency_ewma: Optional[float] = None
+        self.consecutive_errors = 0
+        self.cooldown_until = 0.0
+        self.prompt_chars = 0
+        self.output_chars = 0
+
+    def available(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def record_success(self, latency: float, prompt_chars: int, output_chars: int) -> None:
+        self.calls += 1
+        self.latency_sum += latency
+        self.prompt_chars += prompt_chars
+        self.output_chars += output_chars
+        self.consecutive_errors = 0
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += LATENCY_ALPHA * (latency - self.latency_ewma)
+
+    def record_failure(self, latency: float, rate_limited: bool = False, timed_out: bool = False) -> None:
+        self.calls += 1
+        self.errors += 1
+        self.latency_sum += latency
+        self.consecutive_errors += 1
+        self.rate_limited += rate_limited
+        self.timeouts += timed_out
+
+    def record_client_error(self, latency: float) -> None:
+        """A request the model rejected; not counted against its health"""
+        self.calls += 1
+        self.client_errors += 1
+        self.latency_sum += latency
+
+    def cool_down(self, seconds: float) -> None:
+        self.cooldown_until = time.monotonic() + seconds
+        # Start fresh once the cooldown expires instead of staying "slow" forever
+        self.latency_ewma = None
+        self.consecutive_errors = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "clientErrors": self.client_errors,
+            "rateLimited": self.rate_limited,
+            "timeouts": self.timeouts,
+            "latencySeconds": round(self.latency_sum, 4),
+            "avgLatencySeconds": round(self.latency_sum / self.calls, 4) if self.calls else None,
+            "ewmaLatencySeconds": round(self.latency_ewma, 4) if self.latency_ewma is not None else None,
+            "coolingDown": not self.available(time.monotonic()),
+            "promptChars": self.prompt_chars,
+            "outputChars": self.output_chars,
+        }
+
+
+class ModelRouter:
+    """Picks a Gemini model per endpoint and falls back between tiers"""
+
+    def __init__(
+        self,
+        tier_models: Dict[str, str],
+        endpoint_tiers: Dict[str, str],
+        model_factory: Callable[[str], Any],
+        primary_timeout: float = 20.0,
+        slow_threshold: float = 8.0,
+        cooldown_seconds: float = 30.0,
+        text_only_models: frozenset = TEXT_ONLY_MODELS
+    ):
+        self.tier_models = tier_models
+        self.endpoint_tiers = {
+            **DEFAULT_ENDPOINT_TIERS,
+            **{endpoint: tier for endpoint, tier in endpoint_tiers.items() if tier in (FAST, QUALITY)}
+        }
+        self.model_factory = model_factory
+        self.primary_timeout = primary_timeout
+        self.slow_threshold = slow_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.text_only_models = text_only_models
+        self._models: Dict[str, Any] = {}
+        self.stats: Dict[str, ModelStats] = {}
+        self.usage: Dict[str, Dict[str, int]] = {}
+        self.fallbacks = 0
+
+    def _model(self, name: str) -> Any:
+        model = self._models.get(name)
+        if model is None:
+            model = self._models[name] = self.model_factory(name)
+            self.stats[name] = ModelStats(name)
+        return model
+
+    def candidates(self, endpoint: str, multimodal: bool = False) -> List[str]:
+        """Model names to try, primary tier first and cooled-down models last"""
+        primary_tier = self.endpoint_tiers.get(endpoint, QUALITY)
+        ordered = [self.tier_models[primary_tier]]
+        ordered += [self.tier_models[tier] for tier in (FAST, QUALITY) if tier != primary_tier]
+        names = list(dict.fromkeys(ordered))
+        if multimodal:
+            # Keep the primary even if listed as text-only so the caller sees its real error
+            names = names[:1] + [n for n in names[1:] if n not in self.text_only_models]
+
+        now = time.monotonic()
+        ready = [n for n in names if n not in self.stats or self.stats[n].available(now)]
+        return ready + [n for n in names if n not in ready]
+
+    async def generate(self, endpoint: str, contents: Any) -> Any:
+        """Run generate_content on the best available model for ``endpoint``"""
+        names = self.candidates(endpoint, multimodal=is_multimodal(contents))
+        prompt_chars = len(contents) if isinstance(contents, str) else len(str(contents[0]))
+        first_error: Optional[Exception] = None
+
+        for index, name in enumerate(names):
+            model = self._model(name)
+            stats = self.stats[name]
+            has_fallback = index < len(names) - 1
+            start = time.perf_counter()
+
+            try:
+                call = model.generate_content_async(contents)
+                if has_fallback:
+                    response = await asyncio.wait_for(call, timeout=self.primary_timeout)
+                else:
+                    response = await call
+            except Exception as e:
+                record_span("gemini", start)
+                latency = time.perf_counter() - start
+                timed_out = isinstance(e, asyncio.TimeoutError)
+                rate_limited = is_rate_limited(e)
+                if not (timed_out or rate_limited or is_unavailable(e)):
+                    # The request itself was rejected; another model would not help
+                    stats.record_client_error(latency)
+                    raise
+                stats.record_failure(latency, rate_limited=rate_limited, timed_out=timed_out)
+                if rate_limited or timed_out or stats.consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                    stats.cool_down(self.cooldown_seconds)
+                if first_error is None:
+                    first_error = e
+                if has_fallback:
+                    self.fallbacks += 1
+                continue
+
+            record_span("gemini", start)
+            latency = time.perf_counter() - start
+            try:
+                output_chars = len(response.text)
+            except Exception:
+                output_chars = 0
+            stats.record_success(latency, prompt_chars, output_chars)
+            if has_fallback and stats.latency_ewma > self.slow_threshold:
+                stats.cool_down(self.cooldown_seconds)
+
+            endpoint_usage = self.usage.setdefault(endpoint, {})
+            endpoint_usage[name] = endpoint_usage.get(name, 0) + 1
+            return response
+
+        # Report the primary model's failure, not the fallback's
+        raise first_error
+
+    async def warm_up(self, timeout: float) -> dict:
+        """Create every tier's model and open its connection with a count_tokens call"""
+        async def ping(name: str) -> str:
+            try:
+                await asyncio.wait_for(self._model(name).count_tokens_async("ping"), timeout=timeout)
+                return "ok"
+            except Exception as e:
+                return f"failed: {type(e).__name__}"
+
+        names = list(dict.fromkeys(self.tier_models.values()))
+        return dict(zip(names, await asyncio.gather(*(ping(name) for name in names))))
+
+    def snapshot(self) -> dict:
+        return {
+            "tiers": dict(self.tier_models),
+            "endpoints": dict(self.endpoint_tiers),
+            "fallbacks": self.fallbacks,
+            "models": {name: stats.snapshot() for name, stats in self.stats.items()},
+            "usage": {endpoint: dict(models) for endpoint, models in self.usage.items()},
+        }
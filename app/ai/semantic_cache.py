@@ -0,0 +1,243 @@
+"""
+Near-duplicate cache for generation requests.
+
+Inputs are embedded locally as signed, hashed word and character-trigram
+features (no embedding service), stored in a preallocated NumPy matrix and
+indexed with random-hyperplane LSH tables. A lookup scores only the rows
+that share an LSH bucket with the query and serves the best one if its
+cosine similarity clears the endpoint's threshold.
+
+Only the free text (features, description) is matched fuzzily. The exact
+key (the product name) and the numbers in the text are part of the bucket
+key and must match exactly. Without that, shared feature text drowns out
+small name differences: "Galaxy A14 Black" would serve "Galaxy A14 White",
+"iPhone 13" would serve "iPhone 13 Pro", and "64GB" would serve "128GB".
+"""
+
+import re
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+_SPLIT_ALNUM_RE = re.compile(r"(?<=\d)(?=[a-z])|(?<=[a-z])(?=\d)")
+_STRAY_DOT_RE = re.compile(r"(?<!\d)\.|\.(?!\d)")
+_NON_WORD_RE = re.compile(r"[^a-z0-9.]+")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and split digits from letters ("64GB" -> "64 gb")"""
+    text = _SPLIT_ALNUM_RE.sub(" ", text.lower())
+    text = _STRAY_DOT_RE.sub(" ", text)
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+
+def exact_key(text: str) -> str:
+    """Order-insensitive normalized tokens ("A14 (64 GB, Black)" == "a14 black 64gb")"""
+    return " ".join(sorted(set(normalize_text(text).split())))
+
+
+def embed(text: str, dimensions: int) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """Hashed n-gram vector (L2-normalised) and the numbers found in ``text``"""
+    normalized = normalize_text(text)
+    words = normalized.split()
+    features = [f"w:{word}" for word in words]
+    padded = f" {normalized} "
+    features += [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+    vector = np.zeros(dimensions, dtype=np.float32)
+    if features:
+        hashes = np.fromiter(
+            (zlib.crc32(feature.encode("utf-8")) for feature in features),
+            dtype=np.uint32,
+            count=len(features),
+        )
+        signs = np.where(hashes & 1, 1.0, -1.0).astype(np.float32)
+        np.add.at(vector, (hashes >> 1) % dimensions, signs)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+
+    numbers = tuple(sorted(set(_NUMBER_RE.findall(normalized))))
+    return vector, numbers
+
+
+class SemanticCache:
+    """Fixed-capacity similarity cache with an LSH index and LRU/TTL eviction"""
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_entries: int = 2000,
+        ttl_seconds: float = 3600.0,
+        dimensions: int = 512,
+        tables: int = 8,
+        bits: int = 8,
+        seed: int = 0
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.dimensions = dimensions
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((tables * bits, dimensions)).astype(np.float32)
+        self._tables = tables
+        self._bits = bits
+        self._bit_weights = (1 << np.arange(bits)).astype(np.int64)
+
+        self._vectors = np.zeros((max_entries, dimensions), dtype=np.float32)
+        self._codes = np.zeros((max_entries, tables), dtype=np.int64)
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._occupied = np.zeros(max_entries, dtype=bool)
+        self._values: List[Any] = [None] * max_entries
+        # Per-row (exact key, numbers); rows only share buckets when both match
+        self._exact: List[Optional[Tuple[str, Tuple[str, ...]]]] = [None] * max_entries
+        self._buckets: List[Dict[Tuple[Tuple[str, Tuple[str, ...]], int], Set[int]]] = [{} for _ in range(tables)]
+        self._free = list(range(max_entries - 1, -1, -1))
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return int(self._occupied.sum())
+
+    def _hash(self, vector: np.ndarray) -> np.ndarray:
+        projections = (self._planes @ vector > 0).reshape(self._tables, self._bits)
+        return projections.astype(np.int64) @ self._bit_weights
+
+    def _remove(self, row: int) -> None:
+        exact = self._exact[row]
+        for table, code in enumerate(self._codes[row]):
+            key = (exact, int(code))
+            bucket = self._buckets[table].get(key)
+            if bucket is not None:
+                bucket.discard(row)
+                if not bucket:
+                    del self._buckets[table][key]
+        self._occupied[row] = False
+        self._values[row] = None
+        self._exact[row] = None
+        self._free.append(row)
+
+    def lookup(self, text: str, key: str = "") -> Optional[Tuple[Any, float]]:
+        """Return ``(value, similarity)`` of the closest cached input, if close enough
+
+        ``key`` must match exactly (after ``exact_key`` normalization); only
+        ``text`` is compared by similarity.
+        """
+        vector, numbers = embed(text, self.dimensions)
+        exact = (exact_key(key), numbers)
+        codes = self._hash(vector)
+
+        # Buckets are keyed by the exact key and numbers too, so only exact matches compete
+        candidates: Set[int] = set()
+        for table, code in enumerate(codes):
+            candidates.update(self._buckets[table].get((exact, int(code)), ()))
+
+        if candidates:
+            now = time.monotonic()
+            rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            if vector.any():
+                similarities = self._vectors[rows] @ vector
+            else:
+                # No free text on either side: the exact key alone decides
+                similarities = np.where(self._vectors[rows].any(axis=1), 0.0, 1.0)
+            # Walk candidates from most to least similar until below threshold
+            for index in np.argsort(-similarities):
+                similarity = float(similarities[index])
+                if similarity < self.threshold:
+                    break
+                row = int(rows[index])
+                if self._expires[row] < now:
+                    self._remove(row)
+                    continue
+                self._last_used[row] = now
+                self.hits += 1
+                return self._values[row], similarity
+
+        self.misses += 1
+        return None
+
+    def store(self, text: str, value: Any, key: str = "") -> None:
+        """Insert a value, evicting expired or least recently used entries when full"""
+        vector, numbers = embed(text, self.dimensions)
+        exact = (exact_key(key), numbers)
+        now = time.monotonic()
+
+        if not self._free:
+            expired = np.flatnonzero(self._occupied & (self._expires < now))
+            for row in expired:
+                self._remove(int(row))
+        if not self._free:
+            last_used = np.where(self._occupied, self._last_used, np.inf)
+            self._remove(int(np.argmin(last_used)))
+            self.evictions += 1
+
+        row = self._free.pop()
+        codes = self._hash(vector)
+        self._vectors[row] = vector
+        self._codes[row] = codes
+        self._expires[row] = now + self.ttl_seconds
+        self._last_used[row] = now
+        self._occupied[row] = True
+        self._values[row] = value
+        self._exact[row] = exact
+        for table, code in enumerate(codes):
+            self._buckets[table].setdefault((exact, int(code)), set()).add(row)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self),
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class EndpointSemanticCache:
+    """One SemanticCache per endpoint, each with its own similarity threshold"""
+
+    def __init__(
+        self,
+        thresholds: Dict[str, float],
+        default_threshold: float = 0.92,
+        max_entries: int = 2000,
+        ttl_seconds: float = 3600.0
+    ):
+        self.thresholds = thresholds
+        self.default_threshold = default_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.caches: Dict[str, SemanticCache] = {}
+
+    def _cache(self, endpoint: str) -> SemanticCache:
+        cache = self.caches.get(endpoint)
+        if cache is None:
+            cache = self.caches[endpoint] = SemanticCache(
+                threshold=self.thresholds.get(endpoint, self.default_threshold),
+                max_entries=self.max_entries,
+                ttl_seconds=self.ttl_seconds
+            )
+        return cache
+
+    def warm_up(self, endpoints) -> None:
+        """Allocate the given endpoints' caches and exercise the embedding path"""
+        for endpoint in endpoints:
+            cache = self._cache(endpoint)
+            cache._hash(embed("warm up", cache.dimensions)[0])
+
+    def lookup(self, endpoint: str, text: str, key: str = "") -> Optional[Any]:
+        match = self._cache(endpoint).lookup(text, key)
+        return match[0] if match is not None else None
+
+    def store(self, endpoint: str, text: str, value: Any, key: str = "") -> None:
+        self._cache(endpoint).store(text, value, key)
+
+    def stats(self) -> dict:
+        return {endpoint: cache.stats() for endpoint, cache in self.caches.items()}
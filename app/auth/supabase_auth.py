@@ -2,6 +2,7 @@ import jwt
 from fastapi import HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.config import settings
+from app.tracing import span
 
 security = HTTPBearer()
 
@@ -23,7 +24,8 @@ def decode_jwt(token: str) -> dict:
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
     """Extract and validate user from JWT token"""
     token = credentials.credentials
-    payload = decode_jwt(token)
+    with span("auth"):
+        payload = decode_jwt(token)
     
     if not payload.get("sub"):
         raise HTTPException(status_code=401, detail="Invalid token payload")
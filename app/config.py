@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     # Database
@@ -12,6 +12,13 @@ class Settings(BaseSettings):
     
     # Gemini AI
     GEMINI_API_KEY: str
+    GEMINI_FAST_MODEL: str = "gemini-1.5-flash"
+    GEMINI_QUALITY_MODEL: str = "gemini-pro"
+    # Per-endpoint tier overrides, e.g. "chat=quality,product_tags=fast"
+    GEMINI_ENDPOINT_TIERS: str = ""
+    GEMINI_PRIMARY_TIMEOUT_SECONDS: float = 20.0
+    GEMINI_SLOW_THRESHOLD_SECONDS: float = 8.0
+    GEMINI_COOLDOWN_SECONDS: float = 30.0
     
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:8080"
@@ -19,14 +26,59 @@ class Settings(BaseSettings):
     # Server
     PORT: int = 8000
     AI_SERVICE_API_KEY: str = "zetumall_ai_secret_key_123"
+    
+    # Near-duplicate cache for generation endpoints, thresholds as "endpoint=cosine"
+    SEMANTIC_CACHE_THRESHOLDS: str = "product_description=0.92,seo_metadata=0.95"
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 2000
+    SEMANTIC_CACHE_TTL_SECONDS: float = 3600.0
+    
+    # Prompt budgets
+    SECURITY_BRIEFING_TOKEN_BUDGET: int = 2000
+    
+    # Listing quality / tags: "local", "hybrid" (escalate when unsure) or "gemini"
+    LISTING_ANALYSIS_MODE: str = "hybrid"
+    LISTING_ANALYSIS_MIN_CONFIDENCE: float = 0.6
+    
+    # Response compression (brotli when available and accepted, else gzip)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    
+    # Startup: open the Gemini connection and fill caches in the background
+    GEMINI_WARMUP: bool = True
+    GEMINI_WARMUP_TIMEOUT_SECONDS: float = 10.0
 
     
     @property
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
     
+    @property
+    def gemini_endpoint_tiers(self) -> Dict[str, str]:
+        pairs = (item.split("=", 1) for item in self.GEMINI_ENDPOINT_TIERS.split(",") if "=" in item)
+        return {endpoint.strip(): tier.strip() for endpoint, tier in pairs}
+    
+    @property
+    def semantic_cache_thresholds(self) -> Dict[str, float]:
+        pairs = (item.split("=", 1) for item in self.SEMANTIC_CACHE_THRESHOLDS.split(",") if "=" in item)
+        return {endpoint.strip(): float(threshold) for endpoint, threshold in pairs}
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
 
-settings = Settings()
+class LazySettings:
+    """Creates and validates Settings on first attribute access"""
+    
+    def __init__(self):
+        self._settings: Optional[Settings] = None
+    
+    def load(self) -> Settings:
+        if self._settings is None:
+            self._settings = Settings()
+        return self._settings
+    
+    def __getattr__(self, name: str):
+        return getattr(self.load(), name)
+
+settings = LazySettings()
@@ -0,0 +1,13 @@
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp
+from app.config import settings
+
+class LazyCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that reads allowed origins when the middleware stack is built
+
+    Starlette builds the stack on the first ASGI event (lifespan startup), so
+    settings are not loaded while main.py is being imported.
+    """
+
+    def __init__(self, app: ASGIApp, **options):
+        super().__init__(app, allow_origins=settings.cors_origins_list, **options)
@@ -0,0 +1,29 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.tracing import stage_metrics, start_trace
+
+
+class TracingMiddleware:
+    """Opens a request trace and reports its stages in a Server-Timing header"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = start_trace()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total = time.perf_counter() - trace.started
+                stage_metrics.record("total", total)
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", trace.server_timing(total))
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
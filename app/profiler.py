@@ -0,0 +1,118 @@
+"""
+Time-boxed sampling profiler for the live process.
+
+A background thread snapshots every other thread's Python stack with
+sys._current_frames() at a fixed interval. The result uses the collapsed
+("folded") stack format: one ``frame;frame;frame count`` line per unique
+stack, root first. flamegraph.pl, speedscope and inferno can read it
+directly. The event loop keeps serving requests while sampling, so the
+profile shows real traffic.
+
+Idle threads are skipped by default. For the event loop thread, a leaf-frame
+check is not enough: under uvloop the loop's select is compiled, so the
+leaf Python frame of an idle loop is just the runner. The loop thread
+therefore counts as idle whenever no coroutine is executing on it.
+"""
+
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Dict, List, Optional
+
+MAX_PROFILE_SECONDS = 30.0
+MIN_INTERVAL_SECONDS = 0.001
+
+_COROUTINE_FLAGS = inspect.CO_COROUTINE | inspect.CO_ITERABLE_COROUTINE | inspect.CO_ASYNC_GENERATOR
+
+# (file, function) leaf frames where a thread is blocked waiting, not working
+IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    # ";" separates frames in the folded format, so keep it out of labels
+    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label.replace(";", ":")
+
+
+def _is_idle(frame: FrameType) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES
+
+
+def _runs_coroutine(frame: Optional[FrameType]) -> bool:
+    """True if any frame on the stack belongs to a coroutine or async generator"""
+    while frame is not None:
+        if frame.f_code.co_flags & _COROUTINE_FLAGS:
+            return True
+        frame = frame.f_back
+    return False
+
+
+def _stack(frame: Optional[FrameType]) -> List[str]:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class SamplingProfiler:
+    """Collects folded stacks from all threads for a fixed duration"""
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        include_idle: bool = False,
+        loop_thread_id: Optional[int] = None
+    ):
+        self.interval = max(interval, MIN_INTERVAL_SECONDS)
+        self.include_idle = include_idle
+        self.loop_thread_id = loop_thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.elapsed = 0.0
+
+    def is_idle(self, thread_id: int, frame: FrameType) -> bool:
+        if _is_idle(frame):
+            return True
+        # The event loop thread is idle whenever no coroutine is running on it
+        return thread_id == self.loop_thread_id and not _runs_coroutine(frame)
+
+    def run(self, seconds: float) -> "SamplingProfiler":
+        """Sample for ``seconds`` (capped at MAX_PROFILE_SECONDS); blocks the calling thread"""
+        seconds = min(max(seconds, 0.0), MAX_PROFILE_SECONDS)
+        own_id = threading.get_ident()
+        names: Dict[int, str] = {}
+        started = time.perf_counter()
+        deadline = started + seconds
+
+        while time.perf_counter() < deadline:
+            names.update((thread.ident, thread.name) for thread in threading.enumerate())
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if not self.include_idle and self.is_idle(thread_id, frame):
+                    continue
+                labels = _stack(frame)
+                thread_name = names.get(thread_id, f"thread-{thread_id}").replace(";", ":")
+                self.stacks[";".join([thread_name] + labels)] += 1
+            self.samples += 1
+            time.sleep(max(0.0, min(self.interval, deadline - time.perf_counter())))
+
+        self.elapsed = time.perf_counter() - started
+        return self
+
+    def collapsed(self) -> str:
+        """Folded stacks, heaviest first"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
@@ -3,32 +3,51 @@ Admin Dashboard Router for ZetuMall AI Service
 Provides monitoring, metrics, and API testing interface
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse
+import asyncio
 import psutil
+import threading
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 from app.middleware.auth_middleware import verify_api_key
+from app.ai.gemini_client import gemini_client
+from app.ai.cache import response_cache
+from app.profiler import MAX_PROFILE_SECONDS, SamplingProfiler
+from app.tracing import stage_metrics
 
 router = APIRouter(prefix="/admin/dashboard", tags=["Admin Dashboard"])
 
 # Templates directory
 templates_dir = Path(__file__).parent.parent / "templates"
-templates = Jinja2Templates(directory=str(templates_dir))
+
+
+@lru_cache(maxsize=None)
+def get_templates():
+    """Load Jinja templates on first use instead of at import time"""
+    from fastapi.templating import Jinja2Templates
+    
+    templates = Jinja2Templates(directory=str(templates_dir))
+    templates.get_template("admin_dashboard.html")
+    return templates
+
 
 # Service start time
 START_TIME = time.time()
 
+# Only one profiling session may run at a time
+profile_lock = asyncio.Lock()
+
 @router.get("", response_class=HTMLResponse)
 async def get_dashboard(request: Request, api_key: str = Depends(verify_api_key)):
     """
     Serve the admin dashboard HTML page
     Requires valid API key authentication
     """
-    return templates.TemplateResponse("admin_dashboard.html", {"request": request})
+    return get_templates().TemplateResponse("admin_dashboard.html", {"request": request})
 
 
 @router.get("/api/overview")
@@ -68,6 +87,7 @@ async def get_metrics(api_key: str = Depends(verify_api_key)):
     # CPU and Memory metrics
     cpu_percent = psutil.cpu_percent(interval=0.1)
     memory = psutil.virtual_memory()
+    stages = stage_metrics.snapshot()
     
     return {
         "cpuUsage": cpu_percent,
@@ -76,7 +96,13 @@ async def get_metrics(api_key: str = Depends(verify_api_key)):
             "total": memory.total,
             "percent": memory.percent
         },
-        "requests": 0  # Would need request counter middleware
+        "requests": stages.get("total", {}).get("count", 0),
+        "stages": stages,
+        "models": gemini_client.router.snapshot(),
+        "caches": {
+            "responses": response_cache.stats(),
+            "semantic": gemini_client.semantic_cache.stats()
+        }
     }
 
 
@@ -117,3 +143,35 @@ async def get_activity(api_key: str = Depends(verify_api_key)):
             "duration": 2100
         }
     ]
+
+
+@router.get("/api/profile", response_class=PlainTextResponse)
+async def get_profile(
+    seconds: float = Query(5.0, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    include_idle: bool = False,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Sample the live process for a few seconds and return a flamegraph-ready profile
+    Output is in collapsed stack format (flamegraph.pl, speedscope, inferno)
+    """
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    
+    async with profile_lock:
+        profiler = SamplingProfiler(
+            interval=interval_ms / 1000,
+            include_idle=include_idle,
+            loop_thread_id=threading.get_ident()
+        )
+        # Sample from a worker thread so the event loop keeps serving traffic
+        await asyncio.to_thread(profiler.run, seconds)
+    
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "X-Profile-Samples": str(profiler.samples),
+            "X-Profile-Seconds": f"{profiler.elapsed:.3f}"
+        }
+    )
@@ -3,8 +3,9 @@ from pydantic import BaseModel
 from typing import Optional, List
 from app.auth.supabase_auth import get_current_user
 from app.ai.gemini_client import gemini_client
+from app.tracing import trace_queue
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(trace_queue)])
 
 class ProductDescriptionRequest(BaseModel):
     name: str
@@ -4,6 +4,9 @@ import time
 import psutil
 import os
 
+from app.ai.gemini_client import gemini_client
+from app.tracing import stage_metrics
+
 router = APIRouter()
 
 start_time = time.time()
@@ -32,4 +35,45 @@ async def metrics():
         f'app_cpu_percent {process.cpu_percent()}',
     ]
     
+    # Per-model Gemini latency and usage
+    routing = gemini_client.router.snapshot()
+    model_metrics = [
+        ('gemini_requests_total', 'counter', 'Gemini calls per model', 'calls'),
+        ('gemini_errors_total', 'counter', 'Rate-limit, timeout and unavailable errors per model', 'errors'),
+        ('gemini_client_errors_total', 'counter', 'Requests rejected by the model (not counted against its health)', 'clientErrors'),
+        ('gemini_rate_limited_total', 'counter', 'Rate-limited Gemini calls per model', 'rateLimited'),
+        ('gemini_timeouts_total', 'counter', 'Gemini calls abandoned for a fallback per model', 'timeouts'),
+        ('gemini_latency_seconds_sum', 'counter', 'Total Gemini latency per model', 'latencySeconds'),
+        ('gemini_prompt_chars_total', 'counter', 'Prompt characters sent per model', 'promptChars'),
+        ('gemini_output_chars_total', 'counter', 'Response characters received per model', 'outputChars'),
+    ]
+    for name, metric_type, help_text, key in model_metrics:
+        metrics_data.append(f'# HELP {name} {help_text}')
+        metrics_data.append(f'# TYPE {name} {metric_type}')
+        for model, stats in routing["models"].items():
+            metrics_data.append(f'{name}{{model="{model}"}} {stats[key]}')
+    
+    metrics_data.append('# HELP gemini_endpoint_requests_total Successful Gemini calls per endpoint and model')
+    metrics_data.append('# TYPE gemini_endpoint_requests_total counter')
+    for endpoint, models in routing["usage"].items():
+        for model, count in models.items():
+            metrics_data.append(f'gemini_endpoint_requests_total{{endpoint="{endpoint}",model="{model}"}} {count}')
+    
+    metrics_data.append('# HELP gemini_fallbacks_total Calls that fell back to another model tier')
+    metrics_data.append('# TYPE gemini_fallbacks_total counter')
+    metrics_data.append(f'gemini_fallbacks_total {routing["fallbacks"]}')
+    
+    # Per-stage request timing (the same stages as the Server-Timing header)
+    stages = stage_metrics.snapshot()
+    stage_metrics_spec = [
+        ('app_request_stage_seconds_sum', 'counter', 'Total time spent per request stage', 'seconds'),
+        ('app_request_stage_seconds_count', 'counter', 'Recorded spans per request stage', 'count'),
+        ('app_request_stage_seconds_max', 'gauge', 'Slowest span per request stage', 'maxSeconds'),
+    ]
+    for name, metric_type, help_text, key in stage_metrics_spec:
+        metrics_data.append(f'# HELP {name} {help_text}')
+        metrics_data.append(f'# TYPE {name} {metric_type}')
+        for stage, stats in stages.items():
+            metrics_data.append(f'{name}{{stage="{stage}"}} {stats[key]}')
+    
     return "\n".join(metrics_data)
@@ -0,0 +1,75 @@
+"""
+Application lifespan: configuration check, background warm-up and readiness
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import psutil
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class StartupState:
+    """Import and warm-up timings for the running process"""
+
+    def __init__(self):
+        self.process_started = psutil.Process().create_time()
+        self.imported_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.warmup: dict = {}
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    def mark_imported(self) -> None:
+        self.imported_at = time.time()
+
+    def mark_ready(self) -> None:
+        self.ready_at = time.time()
+
+    def snapshot(self) -> dict:
+        def since_start(timestamp: Optional[float]) -> Optional[float]:
+            return round(timestamp - self.process_started, 3) if timestamp else None
+
+        return {
+            "ready": self.ready,
+            "importSeconds": since_start(self.imported_at),
+            "timeToReadySeconds": since_start(self.ready_at),
+            "warmup": self.warmup,
+            "error": self.error,
+        }
+
+
+startup_state = StartupState()
+
+
+async def warm_up() -> None:
+    """Pre-load Gemini clients and local caches, then mark the service ready"""
+    from app.ai.gemini_client import gemini_client
+
+    try:
+        startup_state.warmup = await gemini_client.warm_up()
+    except Exception as e:
+        # Requests can still be served; they just pay the warm-up cost themselves
+        startup_state.error = str(e)
+        logger.warning(f"Startup warm-up failed: {e}")
+    finally:
+        startup_state.mark_ready()
+        logger.info(f"Service ready in {startup_state.snapshot()['timeToReadySeconds']}s")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Fail fast on missing configuration before accepting traffic
+    settings.load()
+    task = asyncio.create_task(warm_up())
+    yield
+    task.cancel()
@@ -0,0 +1,100 @@
+"""
+Lightweight per-request stage timing.
+
+TracingMiddleware opens a RequestTrace for each HTTP request. Code along
+the request path records named stages with ``span(...)`` or
+``record_span(...)``. Durations of the same stage are summed, emitted as a
+``Server-Timing`` header and aggregated into process-wide stage metrics.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+
+class RequestTrace:
+    """Stage durations (seconds) for one request, in first-recorded order"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.spans.items()]
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+class StageMetrics:
+    """Process-wide count, total and max duration per stage"""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = {"count": 0, "seconds": 0.0, "maxSeconds": 0.0}
+        stage["count"] += 1
+        stage["seconds"] += seconds
+        stage["maxSeconds"] = max(stage["maxSeconds"], seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            name: {
+                "count": int(stage["count"]),
+                "seconds": round(stage["seconds"], 6),
+                "avgSeconds": round(stage["seconds"] / stage["count"], 6),
+                "maxSeconds": round(stage["maxSeconds"], 6),
+            }
+            for name, stage in self.stages.items()
+        }
+
+
+stage_metrics = StageMetrics()
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def start_trace() -> RequestTrace:
+    trace = RequestTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+def record_span(name: str, started: float) -> None:
+    """Record a stage that began at ``started`` (a time.perf_counter() value)"""
+    seconds = time.perf_counter() - started
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, seconds)
+    stage_metrics.record(name, seconds)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, started)
+
+
+async def trace_queue() -> None:
+    """Dependency marking the end of the "queue" stage
+
+    Queue is the time between the request entering the app and its
+    dependencies starting to run (middleware, body read, validation), minus
+    any stages already recorded in that window.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    elapsed = time.perf_counter() - trace.started
+    seconds = max(0.0, elapsed - sum(trace.spans.values()))
+    trace.add("queue", seconds)
+    stage_metrics.record("queue", seconds)
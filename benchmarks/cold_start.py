@@ -0,0 +1,87 @@
+"""
+Cold start benchmark: import time of main.py and time until /health/ready
+
+Each run uses a fresh interpreter. Gemini warm-up is disabled unless
+--network is given, so the numbers measure the service itself.
+
+Usage:
+    python -m benchmarks.cold_start [--runs N] [--network]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PLACEHOLDER_ENV = {
+    "DATABASE_URL": "postgresql://localhost/benchmark",
+    "SUPABASE_URL": "http://localhost",
+    "SUPABASE_ANON_KEY": "benchmark",
+    "SUPABASE_JWT_SECRET": "benchmark",
+    "GEMINI_API_KEY": "benchmark",
+}
+
+HEAVY_MODULES = ("google.generativeai", "numpy", "jinja2")
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({"import": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+READY_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import main
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    while client.get("/health/ready").status_code != 200:
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    state = client.get("/health/ready").json()
+print(json.dumps({"ready": elapsed, "warmup": state["warmup"]}))
+"""
+
+
+def run(script: str, env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--network", action="store_true", help="warm up real Gemini connections")
+    args = parser.parse_args()
+
+    env = {**PLACEHOLDER_ENV, **os.environ}
+    env["GEMINI_WARMUP"] = "true" if args.network else "false"
+
+    imports = [run(IMPORT_SCRIPT, env) for _ in range(args.runs)]
+    readies = [run(READY_SCRIPT, env) for _ in range(args.runs)]
+
+    import_times = [r["import"] * 1000 for r in imports]
+    ready_times = [r["ready"] * 1000 for r in readies]
+    print(f"import main:    median {statistics.median(import_times):.0f} ms (min {min(import_times):.0f} ms)")
+    print(f"heavy modules loaded at import: {imports[-1]['loaded'] or 'none'}")
+    print(f"time to ready:  median {statistics.median(ready_times):.0f} ms (min {min(ready_times):.0f} ms)")
+    print(f"warm-up:        {readies[-1]['warmup'] or 'skipped'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Accuracy and latency benchmark for app.ai.language
+
+Usage:
+    python -m benchmarks.language_detection [--iterations N] [--min-accuracy 0.9]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from app.ai.language import LANGUAGES, detect_language
+
+SAMPLES_PATH = Path(__file__).parent / "data" / "language_samples.jsonl"
+
+
+def load_samples() -> list:
+    with SAMPLES_PATH.open(encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def legacy_detect(message: str) -> str:
+    """Keyword check used by chat_support before the local identifier"""
+    swahili_keywords = ['habari', 'sawa', 'asante', 'tafadhali', 'nini', 'vipi', 'nina', 'nataka']
+    return 'sw' if any(keyword in message.lower() for keyword in swahili_keywords) else 'en'
+
+
+def accuracy(samples: list, detector) -> tuple:
+    confusion = {label: {other: 0 for other in LANGUAGES} for label in LANGUAGES}
+    correct = 0
+    for sample in samples:
+        predicted = detector(sample["text"])
+        confusion[sample["label"]][predicted] += 1
+        correct += predicted == sample["label"]
+    return correct / len(samples), confusion
+
+
+def latency_us(samples: list, detector, iterations: int) -> float:
+    texts = [sample["text"] for sample in samples]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            detector(text)
+    return (time.perf_counter() - start) / (iterations * len(texts)) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--min-accuracy", type=float, default=0.9)
+    args = parser.parse_args()
+
+    samples = load_samples()
+    uncached = detect_language.__wrapped__
+
+    score, confusion = accuracy(samples, detect_language)
+    legacy_score, _ = accuracy(samples, legacy_detect)
+
+    print(f"samples:            {len(samples)}")
+    print(f"accuracy:           {score:.1%} (legacy keyword check: {legacy_score:.1%})")
+    for label in LANGUAGES:
+        print(f"  {label:<6} -> " + ", ".join(f"{k}={v}" for k, v in confusion[label].items()))
+    print(f"latency (uncached): {latency_us(samples, uncached, args.iterations):.2f} us/message")
+    print(f"latency (cached):   {latency_us(samples, detect_language, args.iterations):.2f} us/message")
+    print(f"legacy latency:     {latency_us(samples, legacy_detect, args.iterations):.2f} us/message")
+
+    return 0 if score >= args.min_accuracy else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Latency benchmark for the local listing analyzer (quality score and tags)
+
+Usage:
+    python -m benchmarks.listing_analysis [--iterations N]
+"""
+
+import argparse
+import sys
+import time
+
+from app.ai.listing_analyzer import ListingAnalyzer
+
+LISTINGS = [
+    (
+        "Samsung Galaxy A14 64GB Black",
+        "The Samsung Galaxy A14 comes with a 6.6 inch display, 64GB storage and a 5000mAh battery. "
+        "Triple 50MP camera captures sharp photos. Dual SIM, 4G LTE, Android 13. Warranty: 12 months.",
+        18999.0,
+        "Phones",
+    ),
+    (
+        "Genuine Leather Handbag",
+        "Genuine leather handbag with gold zip, adjustable strap and three inner pockets. Handmade in Nairobi.",
+        4500.0,
+        "Fashion",
+    ),
+    ("SUFURIA SET", "BEST SUFURIA BUY NOW", 1200.0, "Kitchen"),
+]
+
+
+def measure(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for listing in LISTINGS:
+            func(*listing)
+    return (time.perf_counter() - start) / (iterations * len(LISTINGS)) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    analyzer = ListingAnalyzer()
+    quality_us = measure(analyzer.analyze_quality, args.iterations)
+    tags_us = measure(lambda name, description, price, category: analyzer.extract_tags(name, description, category), args.iterations)
+
+    print(f"quality analysis: {quality_us:.1f} us/listing")
+    print(f"tag extraction:   {tags_us:.1f} us/listing")
+    for name, description, price, category in LISTINGS:
+        quality = analyzer.analyze_quality(name, description, price, category)
+        tags = analyzer.extract_tags(name, description, category)
+        print(f"- {name}: score={quality['score']} confidence={quality['confidence']} tags={tags['tags'][:6]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
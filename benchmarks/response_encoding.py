@@ -0,0 +1,149 @@
+"""
+Serialization and compression benchmark for AI responses
+
+Compares the stdlib JSON response with ORJSONResponse, and gzip/brotli
+compression, on a batch-sized enrichment payload. Reports CPU time per
+request (in-process, through the real middleware) and bytes on the wire.
+
+Usage:
+    python -m benchmarks.response_encoding [--items N] [--requests N]
+"""
+
+import argparse
+import gzip
+import random
+import sys
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression_middleware import CompressionMiddleware, brotli
+
+BRANDS = ["Samsung", "Tecno", "Infinix", "Oppo", "Xiaomi", "Nokia", "Ramtons", "Hotpoint", "Von", "Mika",
+          "Bata", "Adidas", "Nike", "Kiko", "Sunking", "Philips", "Sony", "JBL", "Lenovo", "HP"]
+PRODUCTS = ["smartphone", "blender", "microwave", "sneakers", "backpack", "solar lamp", "kettle", "headphones",
+            "laptop", "television", "handbag", "water dispenser", "gas cooker", "power bank", "smart watch",
+            "cooking pot set", "office chair", "duvet", "rice cooker", "bluetooth speaker"]
+ADJECTIVES = ["durable", "lightweight", "compact", "stylish", "energy-saving", "rugged", "elegant", "portable",
+              "affordable", "premium", "ergonomic", "waterproof", "handmade", "versatile", "quiet", "powerful"]
+FEATURES = ["fast charging", "stainless steel body", "non-stick coating", "adjustable strap", "LED indicator",
+            "dual SIM support", "noise cancellation", "auto shut-off", "breathable mesh upper", "USB-C port",
+            "expandable storage", "child lock", "detachable cord", "memory foam padding", "wide-angle camera",
+            "overheat protection", "glass lid", "padded laptop sleeve", "solar panel included", "remote control"]
+AUDIENCES = ["busy families", "students", "small offices", "outdoor lovers", "first-time buyers", "home cooks",
+             "commuters in Nairobi", "gamers", "market traders", "travellers"]
+CLOSINGS = ["Backed by a {n} month warranty.", "Delivered within {n} days across Kenya.",
+            "Pay securely with M-Pesa and track your order.", "Comes with {n} free accessories.",
+            "Rated {n}/5 by verified buyers.", "Stock is limited; order today."]
+
+
+def _sentence(rng: random.Random) -> str:
+    template = rng.choice([
+        "This {adj} {product} from {brand} features {feature} and {feature2}.",
+        "Ideal for {audience}, it combines {feature} with a {adj} design.",
+        "Enjoy {feature} and {feature2}, built for {audience}.",
+        "The {adj} finish and {feature} make it a reliable everyday {product}.",
+        "{brand} engineered this {product} with {feature} so it stays {adj} for years.",
+    ])
+    return template.format(
+        adj=rng.choice(ADJECTIVES), product=rng.choice(PRODUCTS), brand=rng.choice(BRANDS),
+        feature=rng.choice(FEATURES), feature2=rng.choice(FEATURES), audience=rng.choice(AUDIENCES),
+    )
+
+
+def build_payload(items: int, seed: int = 0) -> dict:
+    """Batch of enrichment results with varied, realistic-looking text per item"""
+    rng = random.Random(seed)
+    results = []
+    for i in range(items):
+        brand, product = rng.choice(BRANDS), rng.choice(PRODUCTS)
+        name = f"{brand} {rng.choice(ADJECTIVES).title()} {product.title()} {rng.randint(10, 990)}"
+        sentences = [_sentence(rng) for _ in range(rng.randint(4, 8))]
+        sentences.append(rng.choice(CLOSINGS).format(n=rng.randint(2, 24)))
+        description = " ".join(sentences)
+        results.append({
+            "id": f"prod-{rng.getrandbits(48):012x}",
+            "description": description,
+            "tags": [product, brand.lower(), *rng.sample(FEATURES, 3), rng.choice(ADJECTIVES)],
+            "seo": {"title": f"{name} | ZetuMall", "metaDescription": description[:155]},
+            "analysis": {
+                "score": rng.randint(35, 98),
+                "strengths": rng.sample(["Clear product name", "Detailed description", "Good technical specifications", "Easy to read"], 2),
+                "improvements": rng.sample(["Add product specifications", "Expand the description", "Include customer benefits"], 1),
+            },
+        })
+    return {"success": True, "results": results}
+
+
+def cpu_per_render(response_class, payload: dict, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        response_class(payload).body
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def build_app(response_class, payload: dict) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, gzip_level=6, brotli_quality=5)
+
+    @app.get("/batch")
+    async def batch():
+        return payload
+
+    return app
+
+
+def measure_requests(app: FastAPI, accept_encoding: str, requests: int) -> tuple:
+    client = TestClient(app)
+    headers = {"Accept-Encoding": accept_encoding}
+    response = client.get("/batch", headers=headers)
+    wire_bytes = int(response.headers.get("content-length", len(response.content)))
+    encoding = response.headers.get("content-encoding", "identity")
+
+    start = time.process_time()
+    for _ in range(requests):
+        client.get("/batch", headers=headers)
+    return (time.process_time() - start) / requests * 1e3, wire_bytes, encoding
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    payload = build_payload(args.items)
+
+    print(f"payload: {args.items} items")
+    print("render only (CPU per response):")
+    for response_class in (JSONResponse, ORJSONResponse):
+        print(f"  {response_class.__name__:<16} {cpu_per_render(response_class, payload, args.requests):8.1f} us")
+
+    raw = ORJSONResponse(payload).body
+    print("compression only (CPU per response, bytes):")
+    for level in (1, 6, 9):
+        start = time.process_time()
+        for _ in range(args.requests):
+            body = gzip.compress(raw, compresslevel=level, mtime=0)
+        print(f"  gzip level {level:<6} {(time.process_time() - start) / args.requests * 1e6:8.1f} us  {len(body):>8} B")
+    if brotli is not None:
+        for quality in (1, 4, 5, 6, 11):
+            runs = max(1, args.requests // 20) if quality == 11 else args.requests
+            start = time.process_time()
+            for _ in range(runs):
+                body = brotli.compress(raw, quality=quality)
+            print(f"  brotli q{quality:<8} {(time.process_time() - start) / runs * 1e6:8.1f} us  {len(body):>8} B")
+
+    print("end to end (CPU per request incl. test client, bytes on the wire):")
+    for response_class in (JSONResponse, ORJSONResponse):
+        app = build_app(response_class, payload)
+        for accept in ("identity", "gzip", "br, gzip"):
+            cpu_ms, wire_bytes, encoding = measure_requests(app, accept, args.requests)
+            print(f"  {response_class.__name__:<16} {encoding:<9} {cpu_ms:7.2f} ms  {wire_bytes:>8} B")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
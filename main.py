@@ -1,20 +1,27 @@
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.routers import ai, system, admin_dashboard
-from app.config import settings
+from app.startup import lifespan, startup_state
+from app.middleware.compression_middleware import CompressionMiddleware
+from app.middleware.cors_middleware import LazyCORSMiddleware
 from app.middleware.logging_middleware import LoggingMiddleware
 from app.middleware.auth_middleware import ApiKeyMiddleware
+from app.middleware.tracing_middleware import TracingMiddleware
 
 app = FastAPI(
     title="ZetuMall AI Service",
     version="1.0.0",
-    description="AI-powered features for ZetuMall using Google Gemini"
+    description="AI-powered features for ZetuMall using Google Gemini",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# CORS middleware
+# Compression middleware (brotli/gzip above a size threshold)
+app.add_middleware(CompressionMiddleware)
+
+# CORS middleware (origins are read from settings at startup)
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins_list,
+    LazyCORSMiddleware,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -26,6 +33,9 @@ app.add_middleware(LoggingMiddleware)
 # Authentication middleware
 app.add_middleware(ApiKeyMiddleware)
 
+# Tracing middleware (outermost, so Server-Timing covers the whole stack)
+app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(ai.router, prefix="/api/ai", tags=["AI"])
 app.include_router(system.router, tags=["System"])
@@ -33,13 +43,22 @@ app.include_router(admin_dashboard.router)  # Admin Dashboard
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Liveness check endpoint"""
     return {
         "status": "healthy",
         "service": "zetumall-ai-service",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "ready": startup_state.ready
     }
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness check endpoint; 503 until startup warm-up has finished"""
+    state = startup_state.snapshot()
+    if not state["ready"]:
+        return ORJSONResponse(status_code=503, content={"status": "starting", **state})
+    return {"status": "ready", **state}
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -48,3 +67,5 @@ async def root():
         "docs": "/docs",
         "health": "/health"
     }
+
+startup_state.mark_imported()
@@ -0,0 +1,12 @@
+import os
+
+# Required settings, so the app can be imported and started without a .env file
+for name, value in {
+    "DATABASE_URL": "postgresql://test",
+    "SUPABASE_URL": "http://supabase.test",
+    "SUPABASE_ANON_KEY": "test-anon-key",
+    "SUPABASE_JWT_SECRET": "test-jwt-secret-with-at-least-32-bytes",
+    "GEMINI_API_KEY": "test-gemini-key",
+    "GEMINI_WARMUP": "false",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,104 @@
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware import compression_middleware
+from app.middleware.compression_middleware import CompressionMiddleware, negotiate_encoding
+
+LARGE_TEXT = " ".join(f"word{i % 97}" for i in range(2000))
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("br, gzip", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("*", "br"),
+    ("*;q=0.5, gzip", "gzip"),
+    ("gzip;q=0, *", "br"),
+    ("deflate, gzip;q=bogus", None),
+    ("GZIP", "gzip"),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("br", None),
+    ("br, gzip", "gzip"),
+    ("*", "gzip"),
+])
+def test_negotiate_encoding_without_brotli(monkeypatch, header, expected):
+    monkeypatch.setattr(compression_middleware, "brotli", None)
+    assert negotiate_encoding(header) == expected
+
+
+def make_client(minimum_size=1024):
+    async def small(request):
+        return JSONResponse({"ok": True})
+
+    async def large(request):
+        return JSONResponse({"text": LARGE_TEXT})
+
+    async def encoded(request):
+        body = gzip.compress(LARGE_TEXT.encode())
+        return Response(body, media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    async def binary(request):
+        return Response(b"\x89PNG" + bytes(4096), media_type="image/png")
+
+    async def stream(request):
+        async def chunks():
+            for _ in range(4):
+                yield LARGE_TEXT.encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app = Starlette(routes=[
+        Route("/small", small), Route("/large", large), Route("/encoded", encoded),
+        Route("/binary", binary), Route("/stream", stream),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size, gzip_level=6, brotli_quality=5)
+    return TestClient(app)
+
+
+def test_large_json_is_gzip_compressed():
+    response = make_client().get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(LARGE_TEXT)
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == {"text": LARGE_TEXT}
+
+
+@pytest.mark.skipif(compression_middleware.brotli is None, reason="brotli not installed")
+def test_large_json_prefers_brotli():
+    response = make_client().get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == {"text": LARGE_TEXT}
+
+
+@pytest.mark.parametrize("minimum_size, compressed", [(1024, False), (5, True)])
+def test_size_threshold(minimum_size, compressed):
+    response = make_client(minimum_size).get("/small", headers={"Accept-Encoding": "gzip"})
+    assert ("content-encoding" in response.headers) == compressed
+    assert response.json() == {"ok": True}
+
+
+@pytest.mark.parametrize("path", ["/encoded", "/binary", "/stream"])
+def test_passthrough(path):
+    plain = make_client().get(path, headers={"Accept-Encoding": "identity"})
+    response = make_client().get(path, headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers.get("content-encoding") == plain.headers.get("content-encoding")
+    assert response.content == plain.content
+
+
+def test_no_accept_encoding_is_untouched():
+    response = make_client().get("/large", headers={"Accept-Encoding": ""})
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
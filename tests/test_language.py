@@ -0,0 +1,43 @@
+import pytest
+
+from app.ai.language import ENGLISH, MIXED, SWAHILI, detect_language
+from benchmarks.language_detection import accuracy, load_samples
+
+MIN_ACCURACY = 0.95
+
+
+def test_labelled_samples_accuracy():
+    score, confusion = accuracy(load_samples(), detect_language)
+    assert score >= MIN_ACCURACY, confusion
+
+
+@pytest.mark.parametrize("text", [
+    "Great vibe from this seller, will buy again",
+    "my baba wants a new phone",
+    "My mama loves this dress, thank you",
+    "That dem sold me a fake phone",
+])
+def test_shared_slang_does_not_make_english_mixed(text):
+    assert detect_language(text) == ENGLISH
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Mama yangu anataka simu mpya", SWAHILI),
+    ("Hii phone ni fiti, vibe yake iko sawa but delivery ilichelewa", MIXED),
+])
+def test_shared_slang_in_swahili_and_mixed_text(text, expected):
+    assert detect_language(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Is the Nokia available?",
+    "Do you sell banana, mango and papaya?",
+    "Does the Yamaha piano come with a stool?",
+    "I want a Toyota key holder and a Mazda seat cover",
+])
+def test_bigram_guesses_alone_do_not_make_english_mixed(text):
+    assert detect_language(text) == ENGLISH
+
+
+def test_lexicon_hit_on_minority_side_still_makes_text_mixed():
+    assert detect_language("Habari, is the Nokia available?") == MIXED
@@ -0,0 +1,86 @@
+from app.ai.listing_analyzer import MIN_PRICE_OBSERVATIONS, ListingAnalyzer
+
+NAME = "Samsung Galaxy A14 64GB Black"
+DESCRIPTION = (
+    "The Samsung Galaxy A14 comes with a 6.6 inch display, 64GB storage and a 5000mAh battery. "
+    "Triple 50MP camera captures sharp photos. Dual SIM, 4G LTE, Android 13."
+)
+
+
+def test_listing_counted_once_across_quality_and_tags():
+    analyzer = ListingAnalyzer()
+    analyzer.analyze_quality(NAME, DESCRIPTION, 18999.0, "Phones")
+    analyzer.extract_tags(NAME, DESCRIPTION, "Phones")
+    analyzer.analyze_quality(NAME, DESCRIPTION, 18999.0, "phones ")
+
+    corpus = analyzer.corpus("Phones")
+    assert corpus.documents == 1
+    assert corpus.document_frequency["galaxy"] == 1
+    assert corpus.price_count == 1
+
+
+def test_rechecking_with_other_prices_does_not_shift_statistics():
+    analyzer = ListingAnalyzer()
+    analyzer.extract_tags(NAME, DESCRIPTION, "Phones")
+    analyzer.analyze_quality(NAME, DESCRIPTION, 18999.0, "Phones")
+    corpus = analyzer.corpus("Phones")
+    mean = corpus._log_price_mean
+
+    for fake_price in (1.0, 999999.0, 5.0):
+        analyzer.analyze_quality(NAME, DESCRIPTION, fake_price, "Phones")
+    assert corpus.price_count == 1
+    assert corpus._log_price_mean == mean
+
+
+def test_price_outliers_are_not_learned():
+    analyzer = ListingAnalyzer()
+    for i in range(MIN_PRICE_OBSERVATIONS + 5):
+        analyzer.analyze_quality(f"Phone model {i}", DESCRIPTION, 15000.0 + i * 100, "Phones")
+    corpus = analyzer.corpus("Phones")
+    count = corpus.price_count
+
+    analyzer.analyze_quality("Phone model scam", DESCRIPTION, 15.0, "Phones")
+    assert corpus.price_count == count
+
+
+def test_listing_without_terms_is_not_counted():
+    analyzer = ListingAnalyzer()
+    result = analyzer.extract_tags("!!!", "", "Phones")
+    assert result["confidence"] == 0.0
+    assert analyzer.corpus("Phones").documents == 0
+
+
+def test_number_of_categories_is_bounded():
+    analyzer = ListingAnalyzer(max_categories=3)
+    for i in range(10):
+        analyzer.analyze_quality(NAME, DESCRIPTION, 100.0, f"category-{i}")
+    assert list(analyzer.corpora) == ["category-7", "category-8", "category-9"]
+
+    # Recently used categories survive eviction
+    analyzer.corpus("category-7")
+    analyzer.corpus("category-10")
+    assert list(analyzer.corpora) == ["category-9", "category-7", "category-10"]
+
+
+def test_seen_listings_are_bounded():
+    analyzer = ListingAnalyzer(max_seen_listings=5)
+    for i in range(20):
+        analyzer.extract_tags(f"Phone model {i}", DESCRIPTION, "Phones")
+    assert len(analyzer._seen) == 5
+    assert analyzer.corpus("Phones").documents == 20
+
+
+def test_non_finite_prices_are_rejected():
+    analyzer = ListingAnalyzer()
+    for bad_price in (float("nan"), float("inf"), float("-inf")):
+        result = analyzer.analyze_quality(f"Phone {bad_price}", DESCRIPTION, bad_price, "Phones")
+        assert result["signals"]["price"] == 0.0
+
+    for i in range(MIN_PRICE_OBSERVATIONS + 10):
+        analyzer.analyze_quality(f"Phone model {i}", DESCRIPTION, 15000.0 + i * 100, "Phones")
+    corpus = analyzer.corpus("Phones")
+    assert corpus.price_count == MIN_PRICE_OBSERVATIONS + 10
+    assert corpus.price_z_score(1.0) < -4
+
+    scam = analyzer.analyze_quality("Phone model scam", DESCRIPTION, 1.0, "Phones")
+    assert scam["signals"]["price"] == 0.0
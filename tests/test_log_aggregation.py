@@ -0,0 +1,91 @@
+import pytest
+
+from app.ai.log_aggregation import (
+    aggregate_error_logs,
+    build_security_summary,
+    estimate_tokens,
+    normalize_message,
+)
+
+NOW = 1_700_000_000
+
+
+@pytest.mark.parametrize("message, template", [
+    ("Timeout after 1000ms calling payments", "Timeout after <n>ms calling payments"),
+    ("Order 550e8400-e29b-41d4-a716-446655440000 not found", "Order <uuid> not found"),
+    ("Login failed for jane@example.com from 10.0.0.12:443", "Login failed for <email> from <ip>"),
+    ("Fetch https://api.example.com/x?id=1 failed", "Fetch <url> failed"),
+    ("Unknown key 'abc'  at 2024-05-01T10:00:00Z", "Unknown key <str> at <ts>"),
+    ("Bad token 0xdeadbeefcafe1234", "Bad token <hex>"),
+])
+def test_normalize_message(message, template):
+    assert normalize_message(message) == template
+
+
+def test_identical_templates_are_clustered():
+    logs = [{"message": f"User {i} not found", "path": f"/api/users/{i % 2}"} for i in range(10)]
+    logs.append({"message": "Database unavailable", "level": "CRITICAL"})
+    aggregate = aggregate_error_logs(logs)
+
+    assert aggregate["totalErrors"] == 11
+    assert aggregate["uniqueTemplates"] == 2
+    top = aggregate["clusters"][0]
+    assert (top["template"], top["count"]) == ("User <n> not found", 10)
+    assert top["endpoints"] == ["/api/users/0", "/api/users/1"]
+    assert aggregate["clusters"][1]["level"] == "critical"
+
+
+def test_window_counts_are_anchored_on_newest_entry():
+    ages = [0, 60, 299, 301, 1800, 3600, 3601, 86400, 90000]
+    logs = [{"message": "boom", "timestamp": NOW - age} for age in ages]
+    logs.append({"message": "boom"})  # untimed entries are counted but not windowed
+    aggregate = aggregate_error_logs(logs)
+
+    assert aggregate["timedEntries"] == len(ages)
+    assert aggregate["windows"]["5m"]["errors"] == 3
+    assert aggregate["windows"]["1h"]["errors"] == 6
+    assert aggregate["windows"]["24h"]["errors"] == 8
+
+
+def test_millisecond_and_iso_timestamps():
+    logs = [
+        {"message": "boom", "timestamp": NOW * 1000},
+        {"message": "boom", "created_at": "2023-11-14T22:12:20Z"},  # NOW - 100s
+    ]
+    assert aggregate_error_logs(logs)["windows"]["5m"]["errors"] == 2
+
+
+@pytest.mark.parametrize("budget", [5, 20, 50, 80, 200, 2000])
+def test_summary_respects_token_budget(budget):
+    health = {"status": "UP", "database": "UP", "cpu": 12.5, "memory": {"percent": 40, "used": 123456789}}
+    logs = [{"message": f"Error {kind} code {i}", "timestamp": NOW - i} for i in range(500) for kind in "abcdefgh"]
+    summary = build_security_summary(health, logs, token_budget=budget)
+    assert estimate_tokens(summary) <= budget
+
+
+def test_summary_reports_omitted_patterns():
+    logs = [{"message": f"Failure type {chr(97 + i)}{chr(97 + i)}"} for i in range(26) for _ in range(i + 1)]
+    summary = build_security_summary({"status": "UP"}, logs, token_budget=120)
+    assert "more patterns" in summary and "omitted" in summary
+    assert "x26: Failure type zz" in summary
+
+
+@pytest.mark.parametrize("timestamp", [
+    1e20,
+    -1e13,
+    "9999-12-31T23:59:59-05:00",
+    "0001-01-01T00:00:00+01:00",
+    float("nan"),
+    float("inf"),
+    "not a date",
+    True,
+])
+def test_unrepresentable_timestamps_are_counted_but_not_windowed(timestamp):
+    logs = [{"message": "boom", "timestamp": timestamp}, {"message": "boom", "timestamp": NOW}]
+    aggregate = aggregate_error_logs(logs)
+    assert aggregate["totalErrors"] == 2
+    assert aggregate["timedEntries"] == 1
+    assert aggregate["windows"]["5m"]["errors"] == 1
+
+    summary = build_security_summary({}, [{"message": "x", "timestamp": timestamp}], 2000)
+    assert "Error Summary: 1 errors" in summary
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from app.ai.model_router import FAST, QUALITY, ModelRouter
+
+
+class InvalidArgument(Exception):
+    code = 400
+
+
+class ServiceUnavailable(Exception):
+    code = 503
+
+
+class ResourceExhausted(Exception):
+    code = 429
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """Returns or raises the queued outcomes in order, repeating the last one"""
+
+    def __init__(self, name, outcomes, delay=0.0):
+        self.name = name
+        self.outcomes = list(outcomes)
+        self.delay = delay
+        self.calls = []
+
+    async def generate_content_async(self, contents):
+        self.calls.append(contents)
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return Response(outcome)
+
+
+def make_router(fast_outcomes, quality_outcomes, fast_delay=0.0, **kwargs):
+    models = {
+        "gemini-1.5-flash": StubModel("gemini-1.5-flash", fast_outcomes, fast_delay),
+        "gemini-pro": StubModel("gemini-pro", quality_outcomes),
+    }
+    router = ModelRouter(
+        tier_models={FAST: "gemini-1.5-flash", QUALITY: "gemini-pro"},
+        endpoint_tiers={},
+        model_factory=models.__getitem__,
+        **kwargs
+    )
+    return router, models
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_primary_tier_serves_the_request():
+    router, models = make_router(["fast"], ["quality"])
+    assert run(router.generate("product_tags", "prompt")).text == "fast"
+    assert run(router.generate("product_description", "prompt")).text == "quality"
+    assert router.usage == {"product_tags": {"gemini-1.5-flash": 1}, "product_description": {"gemini-pro": 1}}
+
+
+def test_client_errors_are_raised_without_fallback_or_cooldown():
+    router, models = make_router([InvalidArgument("corrupt image")], ["quality"])
+    for _ in range(5):
+        with pytest.raises(InvalidArgument):
+            run(router.generate("product_tags", "prompt"))
+
+    assert models["gemini-pro"].calls == []
+    assert router.fallbacks == 0
+    stats = router.stats["gemini-1.5-flash"]
+    assert (stats.client_errors, stats.errors) == (5, 0)
+    assert router.candidates("chat")[0] == "gemini-1.5-flash"
+
+
+def test_unavailable_errors_fall_back_and_cool_down_after_streak():
+    router, models = make_router([ServiceUnavailable("503")], ["quality"])
+    for _ in range(3):
+        assert run(router.generate("product_tags", "prompt")).text == "quality"
+
+    assert router.fallbacks == 3
+    assert router.stats["gemini-1.5-flash"].errors == 3
+    assert router.candidates("product_tags")[0] == "gemini-pro"
+
+
+def test_rate_limit_cools_down_immediately():
+    router, models = make_router([ResourceExhausted("429 quota")], ["quality"])
+    assert run(router.generate("chat", "prompt")).text == "quality"
+    assert router.candidates("chat") == ["gemini-pro", "gemini-1.5-flash"]
+
+
+def test_timeout_falls_back():
+    router, models = make_router(["slow"], ["quality"], fast_delay=0.2, primary_timeout=0.01)
+    assert run(router.generate("chat", "prompt")).text == "quality"
+    assert router.stats["gemini-1.5-flash"].timeouts == 1
+
+
+def test_primary_error_is_raised_when_every_model_fails():
+    router, models = make_router([ServiceUnavailable("flash down")], [ResourceExhausted("429 pro quota")])
+    with pytest.raises(ServiceUnavailable, match="flash down"):
+        run(router.generate("chat", "prompt"))
+
+
+def test_image_requests_do_not_fall_back_to_text_only_model():
+    router, models = make_router([ServiceUnavailable("503")], ["quality"])
+    contents = ["describe", {"mime_type": "image/png", "data": b"\x89PNG"}]
+    assert router.candidates("image_analysis", multimodal=True) == ["gemini-1.5-flash"]
+
+    with pytest.raises(ServiceUnavailable):
+        run(router.generate("image_analysis", contents))
+    assert models["gemini-pro"].calls == []
+    assert router.fallbacks == 0
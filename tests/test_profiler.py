@@ -0,0 +1,129 @@
+import asyncio
+import re
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from app.profiler import SamplingProfiler
+from app.routers import admin_dashboard
+
+API_KEY = {"X-API-KEY": "zetumall_ai_secret_key_123"}
+LINE_RE = re.compile(r"^[^; ]+(?:;[^;]+)* \d+$")
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def spin(stop):
+    while not stop.is_set():
+        for _ in range(10000):
+            pass
+
+
+def sleep_loop(stop):
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+def run_loop(stop, started):
+    async def busy():
+        started.set()
+        while not stop.is_set():
+            # Hold the GIL long enough to be preempted inside the coroutine
+            deadline = time.perf_counter() + 0.02
+            while time.perf_counter() < deadline:
+                pass
+            await asyncio.sleep(0)
+
+    asyncio.run(busy())
+
+
+def profile_thread(target, *args, loop_thread=False, include_idle=False):
+    """Profile while ``target`` runs in a thread named "profiled" """
+    stop = threading.Event()
+    thread = threading.Thread(target=target, args=(stop,) + args, name="profiled", daemon=True)
+    thread.start()
+    try:
+        profiler = SamplingProfiler(
+            interval=0.002,
+            include_idle=include_idle,
+            loop_thread_id=thread.ident if loop_thread else None
+        )
+        profiler.run(0.2)
+    finally:
+        stop.set()
+        thread.join()
+    return profiler
+
+
+def profiled_samples(profiler):
+    return sum(count for stack, count in profiler.stacks.items() if stack.startswith("profiled;"))
+
+
+def test_collapsed_output_is_folded_stacks_heaviest_first():
+    profiler = profile_thread(spin)
+
+    lines = profiler.collapsed().splitlines()
+
+    assert lines
+    assert all(LINE_RE.match(line) for line in lines), lines
+    counts = [int(line.rsplit(" ", 1)[1]) for line in lines]
+    assert counts == sorted(counts, reverse=True)
+    assert any(line.startswith("profiled;") and "spin (test_profiler.py:" in line for line in lines)
+
+
+def test_loop_thread_without_running_coroutine_is_idle():
+    # Blocked outside Python frames, like uvloop waiting in compiled code
+    assert profiled_samples(profile_thread(sleep_loop, loop_thread=True)) == 0
+    assert profiled_samples(profile_thread(sleep_loop)) > 0
+    assert profiled_samples(profile_thread(sleep_loop, loop_thread=True, include_idle=True)) > 0
+
+
+def test_loop_thread_running_a_coroutine_is_sampled():
+    started = threading.Event()
+    profiler = profile_thread(run_loop, started, loop_thread=True)
+
+    assert started.is_set()
+    assert profiled_samples(profiler) > 0
+    assert any("busy (test_profiler.py:" in stack for stack in profiler.stacks)
+
+
+def test_profile_requires_api_key():
+    with TestClient(main.app) as client:
+        response = client.get("/admin/dashboard/api/profile", params={"seconds": 0.1})
+
+    assert response.status_code == 401
+
+
+def test_profile_returns_folded_stacks():
+    with TestClient(main.app) as client:
+        response = client.get("/admin/dashboard/api/profile", params={"seconds": 0.1}, headers=API_KEY)
+
+    assert response.status_code == 200
+    assert int(response.headers["x-profile-samples"]) > 0
+    assert all(LINE_RE.match(line) for line in response.text.splitlines())
+
+
+def test_concurrent_profile_is_rejected():
+    with TestClient(main.app) as client:
+        first = {}
+        worker = threading.Thread(target=lambda: first.update(response=client.get(
+            "/admin/dashboard/api/profile", params={"seconds": 1}, headers=API_KEY
+        )))
+        worker.start()
+        try:
+            assert wait_until(admin_dashboard.profile_lock.locked)
+            second = client.get("/admin/dashboard/api/profile", params={"seconds": 0.1}, headers=API_KEY)
+        finally:
+            worker.join()
+
+    assert second.status_code == 409
+    assert first["response"].status_code == 200
@@ -0,0 +1,78 @@
+import pytest
+
+from app.ai.semantic_cache import EndpointSemanticCache, SemanticCache, embed, exact_key
+
+FEATURES = "phones | 6.6 inch display ; 5000mAh battery ; triple 50MP camera ; dual SIM"
+DESCRIPTION = (
+    "phones | The Samsung Galaxy A14 comes with a 6.6 inch display, 64GB storage and a "
+    "5000mAh battery. Triple 50MP camera captures sharp photos."
+)
+
+
+def make_cache():
+    return EndpointSemanticCache({"product_description": 0.92, "seo_metadata": 0.95})
+
+
+@pytest.mark.parametrize("endpoint, text", [("product_description", FEATURES), ("seo_metadata", DESCRIPTION)])
+@pytest.mark.parametrize("cached_name, requested_name", [
+    ("Samsung Galaxy A14 Black", "Samsung Galaxy A14 White"),
+    ("Samsung Galaxy S23 Ultra", "Samsung Galaxy S23"),
+    ("Apple iPhone 13 Pro", "Apple iPhone 13"),
+    ("Apple iPhone 13 Pro", "Apple iPhone 13 Pro Max"),
+    ("Samsung Galaxy A14 64GB", "Samsung Galaxy A14 128GB"),
+])
+def test_product_variants_are_not_served(endpoint, text, cached_name, requested_name):
+    cache = make_cache()
+    cache.store(endpoint, text, "cached output", key=cached_name)
+    assert cache.lookup(endpoint, text, key=requested_name) is None
+
+
+def test_variant_names_collide_without_exact_key():
+    # The failure mode the exact key guards against: the fuzzy score alone is above threshold
+    black, _ = embed("Samsung Galaxy A14 Black | " + FEATURES, 512)
+    white, _ = embed("Samsung Galaxy A14 White | " + FEATURES, 512)
+    assert float(black @ white) >= 0.92
+
+
+@pytest.mark.parametrize("cached_name, requested_name", [
+    ("Samsung Galaxy A14 64GB Black", "Samsung Galaxy A14 (64 GB, black)"),
+    ("Samsung Galaxy A14 Black 64GB", "samsung galaxy a14 64gb black"),
+])
+def test_same_product_written_differently_is_served(cached_name, requested_name):
+    cache = make_cache()
+    cache.store("product_description", FEATURES, "cached output", key=cached_name)
+    assert cache.lookup("product_description", FEATURES, key=requested_name) == "cached output"
+
+
+def test_near_duplicate_features_are_served():
+    cache = make_cache()
+    cache.store("product_description", FEATURES, "cached output", key="Samsung Galaxy A14")
+    rephrased = "Phones | 6.6 inch display; 5000 mAh battery; triple 50 MP camera; dual sim"
+    assert cache.lookup("product_description", rephrased, key="Samsung Galaxy A14") == "cached output"
+
+
+def test_different_numbers_in_features_are_not_served():
+    cache = make_cache()
+    cache.store("product_description", "phones | 64GB storage ; 4GB RAM", "cached output", key="Galaxy A14")
+    assert cache.lookup("product_description", "phones | 128GB storage ; 4GB RAM", key="Galaxy A14") is None
+
+
+def test_empty_text_matches_on_exact_key_only():
+    cache = SemanticCache()
+    cache.store("", "cached output", key="Leather Handbag")
+    assert cache.lookup("", key="leather handbag") == ("cached output", 1.0)
+    assert cache.lookup("", key="Leather Wallet") is None
+
+
+def test_exact_key_is_order_and_punctuation_insensitive():
+    assert exact_key("Samsung Galaxy A14 (64 GB, Black)") == exact_key("black samsung galaxy a14 64gb")
+    assert exact_key("iPhone 13 Pro") != exact_key("iPhone 13")
+
+
+def test_eviction_keeps_buckets_consistent():
+    cache = SemanticCache(max_entries=2)
+    for i in range(5):
+        cache.store(FEATURES, f"output {i}", key=f"Phone {i}")
+    assert len(cache) == 2
+    assert cache.lookup(FEATURES, key="Phone 0") is None
+    assert cache.lookup(FEATURES, key="Phone 4")[0] == "output 4"
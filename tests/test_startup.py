@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.ai.gemini_client import SEMANTIC_CACHE_ENDPOINTS, gemini_client
+from app.startup import startup_state
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def blocked_warm_up(monkeypatch):
+    """Replace the warm-up with one that finishes only when the event is set"""
+    release = threading.Event()
+
+    async def warm_up():
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        return {"stub": "ok"}
+
+    monkeypatch.setattr(gemini_client, "warm_up", warm_up)
+    monkeypatch.setattr(startup_state, "ready_at", None)
+    monkeypatch.setattr(startup_state, "warmup", {})
+    return release
+
+
+def test_readiness_follows_warm_up_while_liveness_stays_up(blocked_warm_up):
+    with TestClient(main.app) as client:
+        health = client.get("/health")
+        assert health.status_code == 200
+        assert health.json()["ready"] is False
+
+        ready = client.get("/health/ready")
+        assert ready.status_code == 503
+        assert ready.json()["status"] == "starting"
+
+        blocked_warm_up.set()
+        assert wait_until(lambda: startup_state.ready)
+
+        ready = client.get("/health/ready")
+        assert ready.status_code == 200
+        assert ready.json()["warmup"] == {"stub": "ok"}
+
+        health = client.get("/health")
+        assert health.status_code == 200
+        assert health.json()["ready"] is True
+
+
+def test_warm_up_allocates_semantic_caches(monkeypatch):
+    monkeypatch.setattr(gemini_client, "_semantic_cache", None)
+    assert asyncio.run(gemini_client.warm_up()) == {}
+    assert set(SEMANTIC_CACHE_ENDPOINTS) <= set(gemini_client.semantic_cache.caches)
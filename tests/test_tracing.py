@@ -0,0 +1,71 @@
+import asyncio
+import contextvars
+import re
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware.tracing_middleware import TracingMiddleware
+from app.tracing import record_span, span, stage_metrics, start_trace, trace_queue
+
+ENTRY_RE = re.compile(r"^[a-z_]+;dur=\d+\.\d$")
+
+
+async def traced(request):
+    with span("work"):
+        time.sleep(0.005)
+    with span("work"):
+        time.sleep(0.005)
+    record_span("parse", time.perf_counter())
+    return PlainTextResponse("ok")
+
+
+def make_client():
+    app = Starlette(routes=[Route("/", traced)])
+    app.add_middleware(TracingMiddleware)
+    return TestClient(app)
+
+
+def timings(header):
+    entries = header.split(", ")
+    assert all(ENTRY_RE.match(entry) for entry in entries), header
+    return [(name, float(duration)) for name, duration in (entry.split(";dur=") for entry in entries)]
+
+
+def test_server_timing_header_sums_repeated_spans_and_ends_with_total():
+    before = stage_metrics.snapshot().get("total", {}).get("count", 0)
+
+    response = make_client().get("/")
+
+    stages = timings(response.headers["server-timing"])
+    names = [name for name, _ in stages]
+    assert names == ["work", "parse", "total"]
+    durations = dict(stages)
+    assert durations["work"] >= 10.0
+    assert durations["total"] >= durations["work"]
+    assert stage_metrics.snapshot()["total"]["count"] == before + 1
+
+
+def test_trace_queue_records_time_not_covered_by_earlier_spans():
+    def run():
+        trace = start_trace()
+        trace.started -= 0.05
+        trace.add("auth", 0.02)
+        asyncio.run(trace_queue())
+        return trace
+
+    trace = contextvars.copy_context().run(run)
+
+    assert 0.029 <= trace.spans["queue"] <= 0.045
+    assert trace.spans["auth"] == 0.02
+
+
+def test_trace_queue_without_a_trace_is_a_no_op():
+    before = stage_metrics.snapshot().get("queue", {}).get("count", 0)
+
+    contextvars.copy_context().run(asyncio.run, trace_queue())
+
+    assert stage_metrics.snapshot().get("queue", {}).get("count", 0) == before